@@ -1,17 +1,23 @@
 import os
+import queue
 import sqlite3
 import random
 import string
 import sys
+import threading
+import time
 import zipfile
 import tempfile
 import logging
-from contextlib import closing
-from datetime import datetime
-from typing import Optional, Dict, Any, List, Union
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import date, datetime
+from functools import lru_cache
+from itertools import groupby
+from typing import Optional, Dict, Any, Iterable, List, Union
 from urllib.parse import urlparse
 
-from flask import Flask, g, render_template, request, redirect, url_for, session, flash, send_file
+from flask import Flask, g, render_template, request, redirect, url_for, session, flash, send_file, Response, stream_with_context
 import secrets
 from io import BytesIO
 
@@ -67,54 +73,510 @@ DATABASE_PATH = os.environ.get('DATABASE_PATH', os.path.join(os.path.dirname(__f
 # Flag to determine if we're using PostgreSQL
 USING_POSTGRES = DATABASE_URL is not None and DATABASE_URL.startswith('postgres')
 
-# Helper function to get the appropriate placeholder for SQL queries
-def get_placeholder():
-    return '%s' if USING_POSTGRES else '?'
+# Schema version tracked via PRAGMA user_version (SQLite only).
+# Bump this when adding a new migration step below.
+SCHEMA_VERSION = 3
+
+# RETURNING support landed in SQLite 3.35; detect once at import time so
+# insert paths can grab new ids without a follow-up query.
+SQLITE_SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Placeholder for SQL queries, resolved once at import time
+PH = '%s' if USING_POSTGRES else '?'
+
+# Dialect-specific SQL built once at import so the hot handlers reference
+# constants instead of re-formatting placeholder strings on every request
+SQL_GAME_BY_ID = f'SELECT * FROM games WHERE id = {PH}'
+SQL_MY_TEAM = f'SELECT * FROM teams WHERE id = {PH}'
+SQL_OPPONENTS_SINGLE = (
+    f'SELECT u.* FROM users u WHERE u.game_id = {PH} AND (u.team_id IS NULL) AND u.id != {PH} ORDER BY u.name'
+)
+SQL_OTHER_TEAMS = (
+    'SELECT t.*, u.name AS leader_name, u.phone AS leader_phone '
+    'FROM teams t JOIN users u ON u.id = t.leader_user_id '
+    f'WHERE t.game_id = {PH} AND t.id != {PH} ORDER BY t.name'
+)
+# IN-list length varies per request; only the placeholder list is formatted in
+SQL_TEAM_MEMBERS_BULK = (
+    'SELECT tm.team_id, u.* FROM team_members tm JOIN users u ON u.id = tm.user_id '
+    'WHERE tm.team_id IN ({}) ORDER BY tm.team_id, u.name'
+)
+SQL_TEAM_MEMBERS_FOR_TEAM = (
+    'SELECT tm.team_id, u.name, u.phone, u.class_section FROM team_members tm '
+    f'JOIN users u ON u.id = tm.user_id WHERE tm.team_id = {PH} ORDER BY u.name'
+)
+# PDF-export queries, kept byte-identical across calls so SQLite's
+# prepared-statement cache always hits
+SQL_EXPORT_SINGLES = (
+    "SELECT game_id, name, phone, COALESCE(class_section, '-') AS class_section FROM users "
+    'WHERE game_id IS NOT NULL AND team_id IS NULL ORDER BY game_id, name'
+)
+SQL_EXPORT_TEAMS = (
+    'SELECT t.game_id, t.id, t.name, t.team_code, u.name AS leader_name, u.phone AS leader_phone, '
+    "COALESCE(u.class_section, '-') AS leader_class_section "
+    'FROM teams t JOIN users u ON u.id = t.leader_user_id ORDER BY t.game_id, t.name'
+)
+SQL_EXPORT_MEMBERS = (
+    "SELECT tm.team_id, u.name, u.phone, COALESCE(u.class_section, '-') AS class_section FROM team_members tm "
+    'JOIN users u ON u.id = tm.user_id ORDER BY tm.team_id, u.name'
+)
+SQL_GAME_SINGLES = (
+    "SELECT u.name, u.phone, COALESCE(u.class_section, '-') AS class_section FROM users u "
+    f'WHERE u.game_id = {PH} AND (u.team_id IS NULL) ORDER BY u.name'
+)
+SQL_GAME_TEAMS = (
+    'SELECT t.id, t.name, t.team_code, u.name AS leader_name, u.phone AS leader_phone, '
+    "COALESCE(u.class_section, '-') AS leader_class_section "
+    f'FROM teams t JOIN users u ON u.id = t.leader_user_id WHERE t.game_id = {PH} ORDER BY t.name'
+)
+SQL_GAME_MEMBERS = (
+    "SELECT tm.team_id, u.name, u.phone, COALESCE(u.class_section, '-') AS class_section FROM team_members tm "
+    'JOIN users u ON u.id = tm.user_id JOIN teams t ON t.id = tm.team_id '
+    f'WHERE t.game_id = {PH} ORDER BY tm.team_id, u.name'
+)
+
+# Short-TTL cache for read-mostly admin queries. Entries are invalidated by
+# the mutation handlers, so the TTL only bounds staleness across workers.
+_ADMIN_CACHE: Dict[str, Any] = {}
+_ADMIN_CACHE_LOCK = threading.Lock()
+ADMIN_CACHE_TTL = 10  # seconds
+
+
+def get_cached(key: str, fn, ttl: float = ADMIN_CACHE_TTL):
+    """Return fn() memoized under key for up to ttl seconds"""
+    now = time.monotonic()
+    with _ADMIN_CACHE_LOCK:
+        hit = _ADMIN_CACHE.get(key)
+        if hit is not None and now - hit[0] < ttl:
+            return hit[1]
+    value = fn()
+    with _ADMIN_CACHE_LOCK:
+        _ADMIN_CACHE[key] = (now, value)
+    return value
+
+
+def invalidate_admin_cache(*keys: str) -> None:
+    """Drop specific cache entries, or everything when called with no keys"""
+    with _ADMIN_CACHE_LOCK:
+        if keys:
+            for key in keys:
+                _ADMIN_CACHE.pop(key, None)
+        else:
+            _ADMIN_CACHE.clear()
+
+
+# Connection pool for the Postgres path, created lazily on first use
+_pg_pool = None
+_pg_pool_lock = threading.Lock()
+
+# Worker-local pool of SQLite connections so requests reuse an already-open
+# connection (pragmas applied once) instead of paying open/setup per request
+_SQLITE_POOL_SIZE = 5
+_sqlite_pool: queue.Queue = queue.Queue(maxsize=_SQLITE_POOL_SIZE)
 
 
 def get_db():
     """Connect to the database and return a connection object with row factory"""
     if USING_POSTGRES:
-        import psycopg2
-        from psycopg2.extras import RealDictCursor
-        
-        # Parse DATABASE_URL to get connection parameters
-        url = urlparse(DATABASE_URL)
-        dbname = url.path[1:]
-        user = url.username
-        password = url.password
-        host = url.hostname
-        port = url.port
-        
-        conn = psycopg2.connect(
-            dbname=dbname,
-            user=user,
-            password=password,
-            host=host,
-            port=port,
-            cursor_factory=RealDictCursor
-        )
+        global _pg_pool
+        if _pg_pool is None:
+            with _pg_pool_lock:
+                if _pg_pool is None:
+                    from psycopg2.pool import ThreadedConnectionPool
+                    from psycopg2.extras import RealDictCursor
+
+                    # Parse DATABASE_URL to get connection parameters
+                    url = urlparse(DATABASE_URL)
+                    _pg_pool = ThreadedConnectionPool(
+                        minconn=1,
+                        maxconn=10,
+                        dbname=url.path[1:],
+                        user=url.username,
+                        password=url.password,
+                        host=url.hostname,
+                        port=url.port,
+                        cursor_factory=RealDictCursor
+                    )
         # Don't use autocommit mode to ensure transaction safety
         # conn.autocommit = True  # Removed - causes data loss issues
-        return conn
+        return _pg_pool.getconn()
     else:
-        # SQLite connection
-        conn = sqlite3.connect(DATABASE_PATH)
+        # Reuse a pooled SQLite connection when one is free
+        try:
+            return _sqlite_pool.get_nowait()
+        except queue.Empty:
+            pass
+        # check_same_thread off: connections move between request threads
+        # via the pool, but only one thread uses a connection at a time
+        conn = sqlite3.connect(DATABASE_PATH, check_same_thread=False)
         conn.row_factory = sqlite3.Row
+        # WAL lets readers proceed during writes and NORMAL halves fsync cost
+        # per commit; WAL persists in the DB file but busy_timeout is
+        # per-connection so all of these run on every connect.
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA busy_timeout=5000')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA cache_size=-20000')
+        # Memory-map up to 256MB of the DB file so reads skip the syscall path
+        conn.execute('PRAGMA mmap_size=268435456')
         return conn
 
 
+def close_db(conn) -> None:
+    """Release a connection back to its pool, closing only on overflow"""
+    if USING_POSTGRES and _pg_pool is not None:
+        _pg_pool.putconn(conn)
+    else:
+        try:
+            # Discard any half-open transaction before the next checkout
+            conn.rollback()
+            _sqlite_pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+
+@contextmanager
+def db_connection():
+    """Check out a connection and release it afterwards (pool-aware)"""
+    conn = get_db()
+    try:
+        yield conn
+    finally:
+        close_db(conn)
+
+
+@contextmanager
+def admin_tx():
+    """Run a multi-statement mutation as one explicit transaction on g.db.
+
+    BEGIN IMMEDIATE takes the SQLite write lock up front so the whole
+    block commits with a single fsync; psycopg2 already defers until
+    commit(), so the extra BEGIN is skipped there.
+    """
+    if not USING_POSTGRES:
+        g.db.execute('BEGIN IMMEDIATE')
+    try:
+        yield g.db
+    except Exception:
+        g.db.rollback()
+        raise
+    else:
+        g.db.commit()
+
+
 def generate_team_code() -> str:
     """Generate a unique 6-character team code"""
     while True:
         code = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
         # Check if code already exists
-        with closing(get_db()) as db:
+        with db_connection() as db:
             exists = db.execute('SELECT 1 FROM teams WHERE team_code = ?', (code,)).fetchone()
             if not exists:
                 return code
 
 
+def insert_team(cur, team_name: str, leader_id: int, game_id: int, team_code: str) -> int:
+    """Insert a team and return its id, via RETURNING where the backend supports it"""
+    if USING_POSTGRES:
+        cur.execute('INSERT INTO teams (name, leader_user_id, game_id, team_code) VALUES (%s,%s,%s,%s) RETURNING id',
+                    (team_name, leader_id, game_id, team_code))
+        return cur.fetchone()['id']
+    if SQLITE_SUPPORTS_RETURNING:
+        return cur.execute('INSERT INTO teams (name, leader_user_id, game_id, team_code) VALUES (?,?,?,?) RETURNING id',
+                           (team_name, leader_id, game_id, team_code)).fetchone()['id']
+    cur.execute('INSERT INTO teams (name, leader_user_id, game_id, team_code) VALUES (?,?,?,?)',
+                (team_name, leader_id, game_id, team_code))
+    return cur.lastrowid
+
+
+# ReportLab style objects are immutable per-process constants; built lazily
+# (reportlab stays an optional import) and shared by both PDF exporters.
+_PDF_STYLES: Dict[str, Any] = {}
+_PDF_STYLES_LOCK = threading.Lock()
+
+
+def get_pdf_styles() -> Dict[str, Any]:
+    """Build the shared ReportLab styles/colors/TableStyles once per process"""
+    if _PDF_STYLES:
+        return _PDF_STYLES
+    with _PDF_STYLES_LOCK:
+        if _PDF_STYLES:
+            return _PDF_STYLES
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.lib.units import mm
+        from reportlab.platypus import TableStyle
+        from reportlab.lib import colors
+
+        styles = getSampleStyleSheet()
+        header_bg = colors.Color(0.92, 0.92, 0.92)
+        _PDF_STYLES.update(
+            styles=styles,
+            title=styles['Title'],
+            subtitle=ParagraphStyle('SubTitle', parent=styles['Heading2'], spaceAfter=6),
+            header_bg=header_bg,
+            row_cols=[12 * mm, None, 32 * mm, 32 * mm],
+            leader_cols=[20 * mm, None, 32 * mm, 32 * mm],
+            empty_cols=[12 * mm, None, 28 * mm, 28 * mm, 28 * mm],
+            row_style=TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), header_bg),
+                ('GRID', (0, 0), (-1, -1), 0.25, colors.grey),
+                ('ALIGN', (0, 0), (0, -1), 'CENTER'),
+                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ]),
+            leader_style=TableStyle([
+                ('BACKGROUND', (0, 0), (0, 0), header_bg),
+                ('GRID', (0, 0), (-1, -1), 0.25, colors.grey),
+                ('FONTNAME', (0, 0), (0, 0), 'Helvetica-Bold'),
+                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ]),
+        )
+    return _PDF_STYLES
+
+
+def append_participants_table(elements: List[Any], participants: Iterable[Any]) -> None:
+    """Append the numbered single-game participants table (shared by both exporters)
+
+    Accepts any row iterable, including a live cursor, so callers can
+    stream rows straight from SQLite without materializing a list.
+    """
+    from reportlab.platypus import Table
+
+    pdf = get_pdf_styles()
+    rows = [["#", "Name", "Phone", "Class/Section"]]
+    for idx, p in enumerate(participants, start=1):
+        rows.append([str(idx), p['name'], p['phone'], p['class_section']])
+    if len(rows) == 1:
+        rows.append(['-', 'No participants', '', ''])
+    table = Table(rows, repeatRows=1, colWidths=pdf['row_cols'])
+    table.setStyle(pdf['row_style'])
+    elements.append(table)
+
+
+def append_team_tables(elements: List[Any], teams: List[sqlite3.Row],
+                       members_by_team: Dict[int, List[sqlite3.Row]]) -> None:
+    """Append one leader + members table pair per team (shared by both exporters)"""
+    from reportlab.platypus import Paragraph, Spacer, Table
+
+    pdf = get_pdf_styles()
+    styles = pdf['styles']
+    for t_idx, t in enumerate(teams, start=1):
+        header = f"{t_idx}. Team: {t['name']}  (Code: {t['team_code']})"
+        elements.append(Paragraph(header, styles['Heading3']))
+
+        leader_rows = [["Leader", t['leader_name'], t['leader_phone'], t['leader_class_section']]]
+        leader_table = Table(leader_rows, colWidths=pdf['leader_cols'])
+        leader_table.setStyle(pdf['leader_style'])
+        elements.append(leader_table)
+
+        members = members_by_team.get(t['id'], [])
+        member_rows = [["#", "Member Name", "Phone", "Class/Section"]]
+        for midx, m in enumerate(members, start=1):
+            member_rows.append([str(midx), m['name'], m['phone'], m['class_section']])
+        if len(member_rows) == 1:
+            member_rows.append(['-', 'No members yet', '', ''])
+        member_table = Table(member_rows, repeatRows=1, colWidths=pdf['row_cols'])
+        member_table.setStyle(pdf['row_style'])
+        elements.append(member_table)
+        elements.append(Spacer(1, 8))
+
+
+# On-disk cache of rendered certificates. Keys include everything that
+# affects the output plus the template image mtime, so editing the
+# template invalidates stale entries automatically.
+# Accepted values for the <certificate_type> URL segment
+VALID_CERT_TYPES = frozenset(('event', 'seminar'))
+
+CERT_CACHE_DIR = os.path.join(os.path.dirname(__file__), 'instance', 'cert_cache')
+CERT_TEMPLATE_PATH = os.path.join(os.path.dirname(__file__), 'static', 'certificates', 'certificate_template.jpg')
+
+
+def cert_template_mtime() -> float:
+    try:
+        return os.path.getmtime(CERT_TEMPLATE_PATH)
+    except OSError:
+        return 0.0
+
+
+def cert_cache_id(key_tuple) -> str:
+    """Stable hash of a certificate cache key; doubles as the response ETag"""
+    import hashlib
+    return hashlib.blake2b(repr(key_tuple).encode()).hexdigest()
+
+
+def cached_pdf(key_tuple, build_fn) -> bytes:
+    """Return cached bytes for key_tuple, building and storing on a miss"""
+    path = os.path.join(CERT_CACHE_DIR, f'{cert_cache_id(key_tuple)}.pdf')
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except OSError:
+        pass
+    data = build_fn()
+    os.makedirs(CERT_CACHE_DIR, exist_ok=True)
+    # Atomic publish so a concurrent reader never sees a partial file
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return data
+
+
+@lru_cache(maxsize=1)
+def _today_str(date_ord: int) -> str:
+    """Fallback event date for certificates, formatted once per calendar day"""
+    return datetime.fromordinal(date_ord).strftime('%B %d, %Y')
+
+
+@lru_cache(maxsize=256)
+def _cached_html_cert(student_name, event_name, event_date, class_section, certificate_type):
+    """Memoized certificate HTML: the same user previews repeatedly, and the
+    arguments fully determine the output"""
+    return generate_html_certificate(
+        student_name=student_name,
+        event_name=event_name,
+        event_date=event_date,
+        class_section=class_section,
+        certificate_type=certificate_type
+    )
+
+
+def _build_participant_zip(args):
+    """Build one participant's dual-certificate ZIP for the bulk route.
+
+    Module-level and fed plain tuples so ProcessPoolExecutor can pickle it;
+    returns None on failure so one bad record doesn't abort the whole run.
+    """
+    pid, name, class_section, game_name, event_date = args
+    try:
+        cache_key = (pid, game_name, event_date, class_section, 'dual', cert_template_mtime())
+        blob = cached_pdf(cache_key, lambda: generate_dual_certificates(
+            student_name=name,
+            event_name=game_name,
+            event_date=event_date,
+            class_section=class_section
+        ).getvalue())
+    except Exception as e:
+        print(f"Error generating certificates for {name}: {e}")
+        return None
+    return f"certificates_{pid}_{name.replace(' ', '_')}.zip", blob
+
+
+class _ZipSink:
+    """Write-only target for ZipFile that hands finished bytes to a stream.
+
+    zipfile accepts unseekable outputs (it tracks offsets itself), so the
+    bulk route can yield each archive member to the client as it is written
+    instead of materializing the whole ZIP in memory.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(data)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _build_bulk_zip(jobs) -> bytes:
+    """Build the complete bulk-certificates ZIP in a worker process.
+
+    Runs the participants serially inside one worker; the per-certificate
+    on-disk cache makes re-runs nearly free.
+    """
+    sink = BytesIO()
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_STORED) as zip_file:
+        for job in jobs:
+            result = _build_participant_zip(job)
+            if result is None:
+                continue
+            file_name, blob = result
+            zip_file.writestr(file_name, blob)
+    return sink.getvalue()
+
+
+# Background PDF jobs: CPU-bound doc.build never releases the GIL, so big
+# exports can run in a worker process and be collected via the status route
+_PDF_JOBS: Dict[str, Any] = {}
+_PDF_JOBS_LOCK = threading.Lock()
+_pdf_executor = None
+
+
+def get_pdf_executor():
+    """Create the PDF worker pool on first use"""
+    global _pdf_executor
+    if _pdf_executor is None:
+        with _PDF_JOBS_LOCK:
+            if _pdf_executor is None:
+                from concurrent.futures import ProcessPoolExecutor
+                _pdf_executor = ProcessPoolExecutor(max_workers=2)
+    return _pdf_executor
+
+
+def build_participants_pdf(buf, games, parts_by_game, teams_by_game, members_by_team) -> None:
+    """Render the full participants PDF into buf from prefetched row dicts.
+
+    Takes only plain picklable data (no g.db access) so it can run either
+    inline or in a worker process.
+    """
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import mm
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, PageBreak
+
+    pdf = get_pdf_styles()
+    styles = pdf['styles']
+    doc = SimpleDocTemplate(buf, pagesize=A4, leftMargin=14*mm, rightMargin=14*mm, topMargin=16*mm, bottomMargin=16*mm)
+    elements: List[Any] = []
+
+    elements.append(Paragraph('Participants List (by Game)', pdf['title']))
+    elements.append(Spacer(1, 6))
+    generated_on = datetime.now().strftime('%Y-%m-%d %H:%M')
+    elements.append(Paragraph(f'Generated on: {generated_on}', styles['Normal']))
+    elements.append(Spacer(1, 12))
+
+    for idx_game, gr in enumerate(games):
+        # Game header
+        subtitle = f"{gr['name']}  —  {gr['type'].upper()}"
+        elements.append(Paragraph(subtitle, pdf['subtitle']))
+
+        if gr['type'] == 'single':
+            append_participants_table(elements, parts_by_game.get(gr['id'], []))
+            elements.append(Spacer(1, 10))
+        else:
+            # Team game
+            teams = teams_by_game.get(gr['id'], [])
+            if not teams:
+                rows = [["-", "No teams", "", "", ""]]
+                table = Table(rows, colWidths=pdf['empty_cols'])
+                elements.append(table)
+                elements.append(Spacer(1, 8))
+            else:
+                append_team_tables(elements, teams, members_by_team)
+
+        # Page break between games for cleaner print, except after the last
+        if idx_game < len(games) - 1:
+            elements.append(PageBreak())
+
+    doc.build(elements)
+
+
+def build_participants_pdf_bytes(games, parts_by_game, teams_by_game, members_by_team) -> bytes:
+    """Worker-process entry point: render and return the PDF as bytes"""
+    buf = tempfile.SpooledTemporaryFile(max_size=2 * 1024 * 1024, mode='w+b')
+    build_participants_pdf(buf, games, parts_by_game, teams_by_game, members_by_team)
+    buf.seek(0)
+    return buf.read()
+
+
 def create_app() -> Flask:
     # Ensure template and static folders are correctly specified
     template_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
@@ -137,9 +599,10 @@ def create_app() -> Flask:
                 ensure_schema_and_seed()
             else:
                 # Run integrity check periodically (every 100th request roughly)
+                # on a background thread so the unlucky request is not slowed down
                 import random
                 if random.randint(1, 100) == 1:
-                    check_database_integrity()
+                    threading.Thread(target=check_database_integrity, daemon=True).start()
                     
         except Exception as e:
             print(f"Database setup error: {e}", file=sys.stderr)
@@ -164,7 +627,7 @@ def create_app() -> Flask:
                     except:
                         pass
             finally:
-                db.close()
+                close_db(db)
 
     ensure_schema_and_seed()
 
@@ -174,7 +637,7 @@ def create_app() -> Flask:
 
 def ensure_schema_and_seed() -> None:
     os.makedirs(os.path.dirname(DATABASE_PATH), exist_ok=True)
-    with closing(get_db()) as db:
+    with db_connection() as db:
         if USING_POSTGRES:
             with db.cursor() as cur:
                 # Users
@@ -302,13 +765,6 @@ def ensure_schema_and_seed() -> None:
                 )
                 """
             )
-        # Add team_size column if missing
-        try:
-            cols = [r[1] for r in cur.execute('PRAGMA table_info(games)').fetchall()]
-            if 'team_size' not in cols:
-                cur.execute('ALTER TABLE games ADD COLUMN team_size INTEGER')
-        except Exception:
-            pass
         # Teams
         cur.execute(
             """
@@ -321,17 +777,6 @@ def ensure_schema_and_seed() -> None:
             )
             """
         )
-        # Add team_code column if missing
-        try:
-            cols = [r[1] for r in cur.execute('PRAGMA table_info(teams)').fetchall()]
-            if 'team_code' not in cols:
-                cur.execute('ALTER TABLE teams ADD COLUMN team_code TEXT')
-            # Generate codes for existing teams that don't have them
-            for team in cur.execute('SELECT id FROM teams WHERE team_code IS NULL').fetchall():
-                code = generate_team_code()
-                cur.execute('UPDATE teams SET team_code = ? WHERE id = ?', (code, team['id']))
-        except Exception:
-            pass
         # Team members
         cur.execute(
             """
@@ -386,6 +831,44 @@ def ensure_schema_and_seed() -> None:
             )
             """
         )
+
+        # Covering indexes for the hot opponents/admin/PDF filters and sorts
+        # so those SELECTs become index range scans returning pre-ordered
+        # rows (EXPLAIN QUERY PLAN shows SEARCH ... USING COVERING INDEX).
+        # phone columns already carry implicit unique indexes via UNIQUE.
+        cur.execute('CREATE INDEX IF NOT EXISTS idx_users_game_team_name ON users(game_id, team_id, name)')
+        cur.execute('CREATE INDEX IF NOT EXISTS idx_teams_game_name ON teams(game_id, name)')
+        cur.execute('CREATE INDEX IF NOT EXISTS idx_tm_team ON team_members(team_id)')
+        # Matches the export ORDER BY (game, name) so the CSV streams in index
+        # order instead of paying a sort pass over the whole participant set.
+        cur.execute('CREATE INDEX IF NOT EXISTS idx_users_game_name ON users(game_id, name)')
+        # Partial index matching the single-game opponents predicate
+        cur.execute('CREATE INDEX IF NOT EXISTS idx_users_free ON users(game_id, name) WHERE team_id IS NULL')
+
+        # Version-gated migrations (SQLite only). Steady-state startups pay for
+        # a single integer read instead of a PRAGMA table_info scan per table.
+        if not USING_POSTGRES:
+            current_version = cur.execute('PRAGMA user_version').fetchone()[0]
+            if current_version < SCHEMA_VERSION:
+                try:
+                    # Legacy databases predate user_version tracking, so check
+                    # the columns once here before altering.
+                    games_cols = [r[1] for r in cur.execute('PRAGMA table_info(games)').fetchall()]
+                    if 'team_size' not in games_cols:
+                        cur.execute('ALTER TABLE games ADD COLUMN team_size INTEGER')
+                    teams_cols = [r[1] for r in cur.execute('PRAGMA table_info(teams)').fetchall()]
+                    if 'team_code' not in teams_cols:
+                        cur.execute('ALTER TABLE teams ADD COLUMN team_code TEXT')
+                    # Generate codes for existing teams that don't have them
+                    for team in cur.execute('SELECT id FROM teams WHERE team_code IS NULL').fetchall():
+                        code = generate_team_code()
+                        cur.execute('UPDATE teams SET team_code = ? WHERE id = ?', (code, team['id']))
+                    users_cols = [r[1] for r in cur.execute('PRAGMA table_info(users)').fetchall()]
+                    if 'class_section' not in users_cols:
+                        cur.execute('ALTER TABLE users ADD COLUMN class_section TEXT')
+                    cur.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+                except Exception:
+                    pass
         db.commit()
 
         # Seed minimal data if empty: only admin user, no games
@@ -412,10 +895,15 @@ def ensure_schema_and_seed() -> None:
                     (row[0], row[1], row[2], row[3]),
                 )
         
-        # Add integrity check - ensure we don't lose the admin user
-        admin_in_users = cur.execute('SELECT 1 FROM users WHERE phone = ?', ('9990001111',)).fetchone()
-        admin_in_allowed = cur.execute('SELECT 1 FROM allowed_users WHERE phone = ?', ('9990001111',)).fetchone()
-        
+        # Add integrity check - ensure we don't lose the admin user.
+        # Both EXISTS probes short-circuit and share one statement.
+        probe = cur.execute(
+            'SELECT EXISTS(SELECT 1 FROM users WHERE phone = ?) AS in_users, '
+            'EXISTS(SELECT 1 FROM allowed_users WHERE phone = ?) AS in_allowed',
+            ('9990001111', '9990001111'),
+        ).fetchone()
+        admin_in_users, admin_in_allowed = probe[0], probe[1]
+
         if not admin_in_users or not admin_in_allowed:
             log_database_operation("RECOVERY", "users", "Re-adding missing admin user")
             if not admin_in_users:
@@ -431,67 +919,73 @@ def ensure_schema_and_seed() -> None:
         
         db.commit()
 
-        # Add class_section column to users if missing (migration for existing DBs)
-        try:
-            cols = [r[1] for r in cur.execute('PRAGMA table_info(users)').fetchall()]
-            if 'class_section' not in cols:
-                cur.execute('ALTER TABLE users ADD COLUMN class_section TEXT')
-                db.commit()
-        except Exception:
-            pass
-
 
 def check_database_integrity():
     """Perform database integrity checks and repair if needed"""
     try:
-        with closing(get_db()) as db:
+        with db_connection() as db:
             cur = db.cursor()
-            
+
+            # Single diagnostic pass: one round-trip tells us which repairs
+            # (if any) are actually needed, instead of probing per check.
+            counts = cur.execute('''
+                WITH admin_users AS (
+                    SELECT COUNT(*) AS c FROM users WHERE phone = ? AND is_admin = 1
+                ), admin_allowed AS (
+                    SELECT COUNT(*) AS c FROM allowed_users WHERE phone = ?
+                ), unsynced AS (
+                    SELECT COUNT(*) AS c FROM users u
+                    LEFT JOIN allowed_users a ON u.phone = a.phone
+                    WHERE a.phone IS NULL
+                ), orphaned AS (
+                    SELECT COUNT(*) AS c FROM team_members tm
+                    LEFT JOIN users u ON tm.user_id = u.id
+                    WHERE u.id IS NULL
+                )
+                SELECT admin_users.c, admin_allowed.c, unsynced.c, orphaned.c
+                FROM admin_users, admin_allowed, unsynced, orphaned
+            ''', ('9990001111', '9990001111')).fetchone()
+            admin_count, allowed_admin_count, unsynced_count, orphan_count = counts[0], counts[1], counts[2], counts[3]
+
             # Check 1: Ensure admin user exists
-            admin_count = cur.execute('SELECT COUNT(*) FROM users WHERE phone = ? AND is_admin = 1', ('9990001111',)).fetchone()[0]
             if admin_count == 0:
                 log_database_operation("REPAIR", "users", "Adding missing admin user")
                 cur.execute(
                     'INSERT INTO users (phone, password, name, class_section, is_admin) VALUES (?,?,?,?,?)',
                     ('9990001111', 'admin123', 'Admin User', 'ADMIN', 1),
                 )
-            
+
             # Check 2: Ensure admin exists in allowed_users
-            allowed_admin = cur.execute('SELECT 1 FROM allowed_users WHERE phone = ?', ('9990001111',)).fetchone()
-            if not allowed_admin:
+            if allowed_admin_count == 0:
                 log_database_operation("REPAIR", "allowed_users", "Adding missing admin to allowed_users")
                 cur.execute(
                     'INSERT INTO allowed_users (phone, password, name, is_admin) VALUES (?,?,?,1)',
                     ('9990001111', 'admin123', 'Admin User'),
                 )
-            
+
             # Check 3: Sync users and allowed_users tables
-            users_without_allowed = cur.execute('''
-                SELECT u.phone, u.password, u.name, u.is_admin 
-                FROM users u 
-                LEFT JOIN allowed_users a ON u.phone = a.phone 
-                WHERE a.phone IS NULL
-            ''').fetchall()
-            
-            for user in users_without_allowed:
-                log_database_operation("REPAIR", "allowed_users", f"Syncing missing user {user[0]}")
-                cur.execute(
+            if unsynced_count:
+                users_without_allowed = cur.execute('''
+                    SELECT u.phone, u.password, u.name, u.is_admin
+                    FROM users u
+                    LEFT JOIN allowed_users a ON u.phone = a.phone
+                    WHERE a.phone IS NULL
+                ''').fetchall()
+
+                log_database_operation("REPAIR", "allowed_users", f"Syncing {len(users_without_allowed)} missing user(s)")
+                cur.executemany(
                     'INSERT INTO allowed_users (phone, password, name, is_admin) VALUES (?,?,?,?)',
-                    (user[0], user[1], user[2], user[3]),
+                    [(u[0], u[1], u[2], u[3]) for u in users_without_allowed],
                 )
-            
+
             # Check 4: Remove orphaned data
-            orphaned_team_members = cur.execute('''
-                SELECT tm.id FROM team_members tm 
-                LEFT JOIN users u ON tm.user_id = u.id 
-                WHERE u.id IS NULL
-            ''').fetchall()
-            
-            if orphaned_team_members:
-                log_database_operation("CLEANUP", "team_members", f"Removing {len(orphaned_team_members)} orphaned team members")
-                for orphan in orphaned_team_members:
-                    cur.execute('DELETE FROM team_members WHERE id = ?', (orphan[0],))
-            
+            if orphan_count:
+                log_database_operation("CLEANUP", "team_members", f"Removing {orphan_count} orphaned team members")
+                cur.execute('''
+                    DELETE FROM team_members
+                    WHERE user_id NOT IN (SELECT id FROM users)
+                ''')
+
             db.commit()
             log_database_operation("SUCCESS", "integrity_check", "Database integrity check completed")
             return True
@@ -505,8 +999,29 @@ def fetch_current_user() -> Optional[sqlite3.Row]:
     user_id = session.get('user_id')
     if not user_id:
         return None
-    row = g.db.execute('SELECT * FROM users WHERE id = ?', (user_id,)).fetchone()
-    return row
+    # Memoized on g: handlers call this several times per request
+    if not hasattr(g, '_current_user'):
+        g._current_user = g.db.execute('SELECT * FROM users WHERE id = ?', (user_id,)).fetchone()
+    return g._current_user
+
+
+def fetch_current_user_with_game() -> Optional[sqlite3.Row]:
+    """Like fetch_current_user, but joins the user's game name in one query"""
+    user_id = session.get('user_id')
+    if not user_id:
+        return None
+    return g.db.execute(
+        'SELECT u.*, g.name AS game_name FROM users u '
+        'LEFT JOIN games g ON g.id = u.game_id WHERE u.id = ?',
+        (user_id,)
+    ).fetchone()
+
+
+def get_cert_settings() -> Optional[sqlite3.Row]:
+    """Return the certificate_settings row, queried at most once per request"""
+    if not hasattr(g, '_cert_settings'):
+        g._cert_settings = g.db.execute('SELECT certificates_enabled, event_date FROM certificate_settings LIMIT 1').fetchone()
+    return g._cert_settings
 
 
 def is_registered_elsewhere(user_row: sqlite3.Row) -> bool:
@@ -547,12 +1062,23 @@ def register_routes(app: Flask) -> None:
             allowed = g.db.execute('SELECT * FROM allowed_users WHERE phone = ? AND password = ?', (phone, password)).fetchone()
             if allowed:
                 cur = g.db.cursor()
-                cur.execute(
-                    'INSERT OR IGNORE INTO users (phone, password, name, class_section, is_admin) VALUES (?,?,?,?,?)',
-                    (allowed['phone'], allowed['password'], allowed['name'], None, allowed['is_admin'])
-                )
-                g.db.commit()
-                user_row = g.db.execute('SELECT * FROM users WHERE phone = ?', (phone,)).fetchone()
+                if not USING_POSTGRES and SQLITE_SUPPORTS_RETURNING:
+                    # RETURNING hands back the created row without a second SELECT.
+                    user_row = cur.execute(
+                        'INSERT OR IGNORE INTO users (phone, password, name, class_section, is_admin) VALUES (?,?,?,?,?) RETURNING *',
+                        (allowed['phone'], allowed['password'], allowed['name'], None, allowed['is_admin'])
+                    ).fetchone()
+                    g.db.commit()
+                    if user_row is None:
+                        # Insert was ignored (row already existed), fetch it instead
+                        user_row = g.db.execute('SELECT * FROM users WHERE phone = ?', (phone,)).fetchone()
+                else:
+                    cur.execute(
+                        'INSERT OR IGNORE INTO users (phone, password, name, class_section, is_admin) VALUES (?,?,?,?,?)',
+                        (allowed['phone'], allowed['password'], allowed['name'], None, allowed['is_admin'])
+                    )
+                    g.db.commit()
+                    user_row = g.db.execute('SELECT * FROM users WHERE phone = ?', (phone,)).fetchone()
                 if user_row:
                     session['user_id'] = user_row['id']
                     flash('Signed in successfully.', 'success')
@@ -613,6 +1139,7 @@ def register_routes(app: Flask) -> None:
             return redirect(url_for('dashboard'))
         g.db.execute('UPDATE users SET game_id = ? WHERE id = ?', (game_id, user['id']))
         g.db.commit()
+        invalidate_admin_cache('overview_counts', 'participants_overview')
         flash('Registered successfully!', 'success')
         return redirect(url_for('dashboard'))
 
@@ -640,11 +1167,11 @@ def register_routes(app: Flask) -> None:
 
             cur = g.db.cursor()
             team_code = generate_team_code()
-            cur.execute('INSERT INTO teams (name, leader_user_id, game_id, team_code) VALUES (?,?,?,?)', (team_name, user['id'], game_id, team_code))
-            team_id = cur.lastrowid
+            team_id = insert_team(cur, team_name, user['id'], game_id, team_code)
             # Assign leader
             cur.execute('UPDATE users SET game_id = ?, team_id = ? WHERE id = ?', (game_id, team_id, user['id']))
             g.db.commit()
+            invalidate_admin_cache('overview_counts', 'participants_overview')
             flash(f'Team "{team_name}" created successfully! Team Code: {team_code}. Share this code with your team members.', 'success')
             return redirect(url_for('dashboard'))
         return render_template('team_register.html', game=game)
@@ -690,6 +1217,7 @@ def register_routes(app: Flask) -> None:
             cur.execute('INSERT INTO team_members (team_id, user_id) VALUES (?,?)', (team['id'], user['id']))
             cur.execute('UPDATE users SET game_id = ?, team_id = ? WHERE id = ?', (team['game_id'], team['id'], user['id']))
             g.db.commit()
+            invalidate_admin_cache('overview_counts', 'participants_overview')
             flash(f'Successfully joined team "{team["name"]}"!', 'success')
             return redirect(url_for('dashboard'))
         
@@ -704,51 +1232,45 @@ def register_routes(app: Flask) -> None:
             flash('Join an event first to see opponents.', 'warning')
             return redirect(url_for('dashboard'))
 
-        # Use the appropriate placeholder based on database type
-        placeholder = '%s' if USING_POSTGRES else '?'
-        
-        game = g.db.execute(f'SELECT * FROM games WHERE id = {placeholder}', (user['game_id'],)).fetchone()
+        game = g.db.execute(SQL_GAME_BY_ID, (user['game_id'],)).fetchone()
         if not game:
             flash('Game not found.', 'danger')
             return redirect(url_for('dashboard'))
 
         if game['type'] == 'single':
             opponents_list = g.db.execute(
-                f'SELECT u.* FROM users u WHERE u.game_id = {placeholder} AND (u.team_id IS NULL) AND u.id != {placeholder} ORDER BY u.name',
+                SQL_OPPONENTS_SINGLE,
                 (user['game_id'], user['id']),
             ).fetchall()
             return render_template('opponents.html', game=game, view_type='single', opponents=opponents_list)
 
         # Team game: list other teams and their members
-        placeholder = '%s' if USING_POSTGRES else '?'
-        
-        my_team = g.db.execute(f'SELECT * FROM teams WHERE id = {placeholder}', (user['team_id'],)).fetchone()
+        my_team = g.db.execute(SQL_MY_TEAM, (user['team_id'],)).fetchone()
         if not my_team:
             flash('Your team was not found.', 'danger')
             return redirect(url_for('dashboard'))
 
         other_teams = g.db.execute(
-            f'SELECT t.*, u.name AS leader_name, u.phone AS leader_phone '
-            f'FROM teams t JOIN users u ON u.id = t.leader_user_id '
-            f'WHERE t.game_id = {placeholder} AND t.id != {placeholder} ORDER BY t.name',
+            SQL_OTHER_TEAMS,
             (my_team['game_id'], my_team['id']),
         ).fetchall()
 
         # Build members map for all other teams
         team_ids = [t['id'] for t in other_teams]
         members_map: Dict[int, List[sqlite3.Row]] = {}
-        
-        # Use a more compatible approach that works with both SQLite and PostgreSQL
-        placeholder = '%s' if USING_POSTGRES else '?'
-        
-        for team_id in team_ids:
+
+        # Fetch members for all teams in one query instead of one per team;
+        # rows arrive sorted by team_id so they group in a single pass
+        if team_ids:
+            in_clause = ','.join([PH] * len(team_ids))
             rows = g.db.execute(
-                f'SELECT tm.team_id, u.* FROM team_members tm JOIN users u ON u.id = tm.user_id '
-                f'WHERE tm.team_id = {placeholder} ORDER BY u.name',
-                (team_id,)
+                SQL_TEAM_MEMBERS_BULK.format(in_clause),
+                tuple(team_ids),
             ).fetchall()
-            for r in rows:
-                members_map.setdefault(r['team_id'], []).append(r)
+            members_map = {
+                team_id: list(members)
+                for team_id, members in groupby(rows, key=lambda r: r['team_id'])
+            }
 
         return render_template(
             'opponents.html',
@@ -784,6 +1306,7 @@ def register_routes(app: Flask) -> None:
                 else:
                     g.db.execute('INSERT INTO games (name, description, slots, type, team_size) VALUES (?,?,?,?,NULL)', (name, description, slots, gtype))
                 g.db.commit()
+                invalidate_admin_cache('games', 'overview_counts')
                 flash('Game added.', 'success')
                 active_tab = 'addgame'
             else:
@@ -797,17 +1320,24 @@ def register_routes(app: Flask) -> None:
             if not cname or not cphone or not cpass:
                 flash('All credential fields are required.', 'danger')
             else:
-                exists = g.db.execute('SELECT 1 FROM allowed_users WHERE phone = ?', (cphone,)).fetchone()
-                if exists:
+                # Idempotent inserts: duplicates are skipped in SQL instead of
+                # probing with SELECTs first, and both rows commit together
+                if USING_POSTGRES:
+                    allowed_sql = 'INSERT INTO allowed_users (phone, password, name, is_admin) VALUES (%s,%s,%s,0) ON CONFLICT (phone) DO NOTHING'
+                    users_sql = 'INSERT INTO users (phone, password, name, is_admin) VALUES (%s,%s,%s,0) ON CONFLICT (phone) DO NOTHING'
+                else:
+                    allowed_sql = 'INSERT OR IGNORE INTO allowed_users (phone, password, name, is_admin) VALUES (?,?,?,0)'
+                    users_sql = 'INSERT OR IGNORE INTO users (phone, password, name, is_admin) VALUES (?,?,?,0)'
+                cur = g.db.cursor()
+                cur.execute(allowed_sql, (cphone, cpass, cname))
+                inserted = cur.rowcount
+                # Optionally ensure a user row exists for quick usage
+                cur.execute(users_sql, (cphone, cpass, cname))
+                g.db.commit()
+                if inserted == 0:
                     flash('Phone already exists in credentials.', 'warning')
                 else:
-                    g.db.execute('INSERT INTO allowed_users (phone, password, name, is_admin) VALUES (?,?,?,0)', (cphone, cpass, cname))
-                    g.db.commit()
-                    # Optionally ensure a user row exists for quick usage
-                    urow = g.db.execute('SELECT id FROM users WHERE phone = ?', (cphone,)).fetchone()
-                    if not urow:
-                        g.db.execute('INSERT INTO users (phone, password, name, is_admin) VALUES (?,?,?,0)', (cphone, cpass, cname))
-                        g.db.commit()
+                    invalidate_admin_cache('allowed_list', 'participants_overview')
                     flash('Credential added.', 'success')
                 # stay on overview (credentials accordion)
                 active_tab = 'overview'
@@ -833,13 +1363,24 @@ def register_routes(app: Flask) -> None:
                 flash('Provide one or more phone numbers.', 'danger')
             else:
                 phones = [p.strip() for p in phones_text.split('\n') if p.strip()]
-                inserted = 0
-                for p in phones:
-                    try:
-                        g.db.execute('INSERT INTO whitelist_phones (phone) VALUES (?)', (p,))
-                        inserted += 1
-                    except Exception:
-                        pass
+                # Stage the paste into a temp table, then anti-join against the
+                # whitelist so dedup happens inside the engine and rowcount on
+                # the single INSERT gives an exact count of new phones.
+                cur = g.db.cursor()
+                cur.execute('CREATE TEMP TABLE IF NOT EXISTS _wl_stage (phone TEXT PRIMARY KEY)')
+                cur.execute('DELETE FROM _wl_stage')
+                if USING_POSTGRES:
+                    stage_sql = 'INSERT INTO _wl_stage (phone) VALUES (%s) ON CONFLICT (phone) DO NOTHING'
+                else:
+                    stage_sql = 'INSERT OR IGNORE INTO _wl_stage (phone) VALUES (?)'
+                cur.executemany(stage_sql, [(p,) for p in phones])
+                cur.execute(
+                    'INSERT INTO whitelist_phones (phone) '
+                    'SELECT s.phone FROM _wl_stage s '
+                    'LEFT JOIN whitelist_phones w ON w.phone = s.phone '
+                    'WHERE w.phone IS NULL'
+                )
+                inserted = cur.rowcount if cur.rowcount and cur.rowcount > 0 else 0
                 g.db.commit()
                 flash(f'Whitelist updated. Added {inserted} new phone(s).', 'success')
             active_tab = 'whitelist'
@@ -865,7 +1406,7 @@ def register_routes(app: Flask) -> None:
                     flash('Error removing phone from whitelist. Please try again.', 'danger')
             active_tab = 'whitelist'
 
-        games = g.db.execute('SELECT * FROM games ORDER BY id').fetchall()
+        games = get_cached('games', lambda: g.db.execute('SELECT * FROM games ORDER BY id').fetchall())
         single_participants = g.db.execute(
             'SELECT u.id as user_id, u.name, u.phone, g.name AS game_name FROM users u JOIN games g ON g.id = u.game_id WHERE g.type = "single" ORDER BY g.name, u.name'
         ).fetchall()
@@ -876,34 +1417,45 @@ def register_routes(app: Flask) -> None:
         team_members = g.db.execute(
             'SELECT tm.team_id, u.id as user_id, u.name, u.phone FROM team_members tm JOIN users u ON u.id = tm.user_id ORDER BY tm.team_id, u.name'
         ).fetchall()
-        # Build a dict team_id -> members
-        members_map: Dict[int, List[sqlite3.Row]] = {}
-        for tm in team_members:
-            members_map.setdefault(tm['team_id'], []).append(tm)
+        # Build a dict team_id -> members (rows arrive sorted by team_id)
+        members_map: Dict[int, List[sqlite3.Row]] = {
+            team_id: list(members)
+            for team_id, members in groupby(team_members, key=lambda r: r['team_id'])
+        }
 
         # Group teams by game for rendering dropdowns per team
-        game_to_teams: Dict[int, List[sqlite3.Row]] = {}
+        # (teams are ordered by game name, not game_id, so groupby won't do)
+        game_to_teams: Dict[int, List[sqlite3.Row]] = defaultdict(list)
         for t in teams:
-            game_to_teams.setdefault(t['game_id'], []).append(t)
+            game_to_teams[t['game_id']].append(t)
 
-        # Build per-game participants and counts
-        game_participants: Dict[int, List[sqlite3.Row]] = {}
-        game_member_counts: Dict[int, int] = {}
-        for g_row in games:
-            if g_row['type'] == 'single':
-                plist = g.db.execute(
-                    'SELECT u.id as user_id, u.name, u.phone FROM users u WHERE u.game_id = ? AND (u.team_id IS NULL) ORDER BY u.name',
-                    (g_row['id'],),
-                ).fetchall()
-            else:
-                plist = g.db.execute(
-                    'SELECT u.id as user_id, u.name, u.phone, t.id as team_id, t.name as team_name, CASE WHEN u.id = t.leader_user_id THEN 1 ELSE 0 END as is_leader FROM users u JOIN teams t ON t.id = u.team_id WHERE t.game_id = ? ORDER BY t.name, is_leader DESC, u.name',
-                    (g_row['id'],),
-                ).fetchall()
-            game_participants[g_row['id']] = plist
-            game_member_counts[g_row['id']] = len(plist)
-
-        # Overview stats per game
+        # Build per-game participants and counts with two bucketed queries
+        # instead of one query per game
+        game_participants: Dict[int, List[sqlite3.Row]] = {g_row['id']: [] for g_row in games}
+        for row in g.db.execute(
+            'SELECT u.game_id, u.id as user_id, u.name, u.phone FROM users u '
+            'WHERE u.game_id IS NOT NULL AND u.team_id IS NULL ORDER BY u.name'
+        ).fetchall():
+            if row['game_id'] in game_participants:
+                game_participants[row['game_id']].append(row)
+        for row in g.db.execute(
+            'SELECT t.game_id, u.id as user_id, u.name, u.phone, t.id as team_id, t.name as team_name, '
+            'CASE WHEN u.id = t.leader_user_id THEN 1 ELSE 0 END as is_leader '
+            'FROM users u JOIN teams t ON t.id = u.team_id ORDER BY t.name, is_leader DESC, u.name'
+        ).fetchall():
+            if row['game_id'] in game_participants:
+                game_participants[row['game_id']].append(row)
+        game_member_counts = {gid: len(plist) for gid, plist in game_participants.items()}
+
+        # Overview stats per game: two GROUP BY queries replace a COUNT per game
+        single_counts, team_counts = get_cached('overview_counts', lambda: (
+            {r['game_id']: r['c'] for r in g.db.execute(
+                'SELECT game_id, COUNT(1) AS c FROM users WHERE game_id IS NOT NULL AND team_id IS NULL GROUP BY game_id'
+            ).fetchall()},
+            {r['game_id']: r['c'] for r in g.db.execute(
+                'SELECT game_id, COUNT(1) AS c FROM teams GROUP BY game_id'
+            ).fetchall()},
+        ))
         overview_stats: List[Dict[str, Any]] = []
         total_games = len(games)
         total_slots = 0
@@ -911,9 +1463,9 @@ def register_routes(app: Flask) -> None:
         for g_row in games:
             slots = int(g_row['slots'])
             if g_row['type'] == 'single':
-                filled = g.db.execute('SELECT COUNT(1) FROM users WHERE game_id = ? AND (team_id IS NULL)', (g_row['id'],)).fetchone()[0]
+                filled = single_counts.get(g_row['id'], 0)
             else:
-                filled = g.db.execute('SELECT COUNT(1) FROM teams WHERE game_id = ?', (g_row['id'],)).fetchone()[0]
+                filled = team_counts.get(g_row['id'], 0)
             remaining = max(0, slots - int(filled))
             overview_stats.append({
                 'id': g_row['id'],
@@ -928,7 +1480,9 @@ def register_routes(app: Flask) -> None:
 
         # All participants overview (admin visibility)
         # This query needs to handle users who are not in any game yet
-        participants_overview = g.db.execute(
+        # Cached between requests: the 3-way join only changes when admins
+        # (or signups) mutate membership, and those handlers invalidate it
+        participants_overview = get_cached('participants_overview', lambda: g.db.execute(
             """
             SELECT 
                 u.id AS user_id, 
@@ -947,10 +1501,10 @@ def register_routes(app: Flask) -> None:
             LEFT JOIN teams t ON t.id = u.team_id
             ORDER BY u.name
             """
-        ).fetchall()
+        ).fetchall())
 
         # Allowed users (credentials list)
-        allowed_list = g.db.execute('SELECT * FROM allowed_users ORDER BY name').fetchall()
+        allowed_list = get_cached('allowed_list', lambda: g.db.execute('SELECT * FROM allowed_users ORDER BY name').fetchall())
         
         # Whitelist with registration status
         whitelist_list = g.db.execute('''
@@ -980,7 +1534,10 @@ def register_routes(app: Flask) -> None:
             whitelist_list=whitelist_list,
             game_to_teams=game_to_teams,
             active_tab=active_tab,
-            cert_settings=g.db.execute('SELECT * FROM certificate_settings LIMIT 1').fetchone(),
+            cert_settings=get_cert_settings(),
+            # Always fetched: the admin tabs switch client-side, so the
+            # certificates pane renders from this same page load no matter
+            # which tab the URL asked for
             certificate_downloads=g.db.execute('''
                 SELECT cd.download_date, u.name, u.phone, u.class_section, g.name as game_name
                 FROM certificate_downloads cd
@@ -997,33 +1554,48 @@ def register_routes(app: Flask) -> None:
         if not user or not user['is_admin']:
             flash('Admin access required.', 'danger')
             return redirect(url_for('login'))
-        # Export CSV dynamically
+        # Export CSV as a stream so rows reach the client as they are written
+        import codecs
         import csv
-        from io import StringIO, BytesIO
-
-        output = StringIO()
-        writer = csv.writer(output)
-        writer.writerow(['Type', 'Game', 'Team', 'Participant Name', 'Phone'])
+        from io import StringIO
+
+        def generate():
+            output = StringIO()
+            writer = csv.writer(output)
+
+            def emit(row):
+                writer.writerow(row)
+                data = output.getvalue()
+                output.seek(0)
+                output.truncate(0)
+                return data
+
+            yield emit(['Type', 'Game', 'Team', 'Participant Name', 'Phone'])
+
+            # The generator runs after teardown_request has already released
+            # g.db, so it checks out its own pooled connection for the scan
+            with db_connection() as db:
+                # Single participants
+                for row in db.execute(
+                    'SELECT g.name AS game, u.name, u.phone FROM users u JOIN games g ON g.id = u.game_id WHERE g.type = "single" ORDER BY g.name, u.name'
+                ):
+                    yield emit(['single', row['game'], '', row['name'], row['phone']])
+
+                # Team participants: one JOIN instead of a member query per team
+                for row in db.execute(
+                    'SELECT g.name AS game, t.name AS team, u.name, u.phone '
+                    'FROM team_members tm JOIN users u ON u.id = tm.user_id '
+                    'JOIN teams t ON t.id = tm.team_id JOIN games g ON g.id = t.game_id '
+                    'ORDER BY g.name, t.name, u.name'
+                ):
+                    yield emit(['team', row['game'], row['team'], row['name'], row['phone']])
 
-        # Single participants
-        for row in g.db.execute(
-            'SELECT g.name AS game, u.name, u.phone FROM users u JOIN games g ON g.id = u.game_id WHERE g.type = "single" ORDER BY g.name, u.name'
-        ):
-            writer.writerow(['single', row['game'], '', row['name'], row['phone']])
-
-        # Team participants
-        for t in g.db.execute('SELECT t.id, t.name, g.name AS game FROM teams t JOIN games g ON g.id = t.game_id ORDER BY g.name, t.name'):
-            for m in g.db.execute(
-            'SELECT u.name, u.phone FROM team_members tm JOIN users u ON u.id = tm.user_id WHERE tm.team_id = ? ORDER BY u.name',
-            (t['id'],),
-        ):
-                writer.writerow(['team', t['game'], t['name'], m['name'], m['phone']])
-
-        mem = BytesIO()
-        mem.write(output.getvalue().encode('utf-8'))
-        mem.seek(0)
         filename = f"participants_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        return send_file(mem, mimetype='text/csv', as_attachment=True, download_name=filename)
+        return Response(
+            stream_with_context(codecs.iterencode(generate(), 'utf-8')),
+            mimetype='text/csv',
+            headers={'Content-Disposition': f'attachment; filename={filename}'},
+        )
 
     @app.route('/admin/export/<int:game_id>')
     def admin_export_game(game_id: int):
@@ -1037,42 +1609,54 @@ def register_routes(app: Flask) -> None:
             flash('Game not found.', 'danger')
             return redirect(url_for('admin', tab='gamesctl'))
 
+        import codecs
         import csv
-        from io import StringIO, BytesIO
+        from io import StringIO
 
-        output = StringIO()
-        writer = csv.writer(output)
+        def generate():
+            output = StringIO()
+            writer = csv.writer(output)
 
-        if game['type'] == 'single':
-            writer.writerow(['Game', 'Participant Name', 'Phone', 'Class/Section'])
-            rows = g.db.execute(
-                'SELECT u.name, u.phone, u.class_section FROM users u WHERE u.game_id = ? AND (u.team_id IS NULL) ORDER BY u.name',
-                (game_id,),
-            ).fetchall()
-            for r in rows:
-                writer.writerow([game['name'], r['name'], r['phone'], r['class_section'] or ''])
-        else:
-            writer.writerow(['Game', 'Team', 'Team Code', 'Role', 'Name', 'Phone', 'Class/Section'])
-            # Leader rows
-            for t in g.db.execute(
-                'SELECT t.id, t.name AS team_name, t.team_code, u.name AS leader_name, u.phone AS leader_phone, u.class_section AS leader_class_section '
-                'FROM teams t JOIN users u ON u.id = t.leader_user_id WHERE t.game_id = ? ORDER BY t.name',
-                (game_id,),
-            ):
-                writer.writerow([game['name'], t['team_name'], t['team_code'], 'Leader', t['leader_name'], t['leader_phone'], t['leader_class_section'] or ''])
-                # Member rows
-                for m in g.db.execute(
-                    'SELECT u.name, u.phone, u.class_section FROM team_members tm JOIN users u ON u.id = tm.user_id WHERE tm.team_id = ? ORDER BY u.name',
-                    (t['id'],),
-                ):
-                    writer.writerow([game['name'], t['team_name'], t['team_code'], 'Member', m['name'], m['phone'], m['class_section'] or ''])
+            def emit(row):
+                writer.writerow(row)
+                data = output.getvalue()
+                output.seek(0)
+                output.truncate(0)
+                return data
+
+            # Like admin_export, the stream outlives the request's g.db, so
+            # the scan runs on a connection the generator owns
+            if game['type'] == 'single':
+                yield emit(['Game', 'Participant Name', 'Phone', 'Class/Section'])
+                with db_connection() as db:
+                    for r in db.execute(
+                        'SELECT u.name, u.phone, u.class_section FROM users u WHERE u.game_id = ? AND (u.team_id IS NULL) ORDER BY u.name',
+                        (game_id,),
+                    ):
+                        yield emit([game['name'], r['name'], r['phone'], r['class_section'] or ''])
+            else:
+                yield emit(['Game', 'Team', 'Team Code', 'Role', 'Name', 'Phone', 'Class/Section'])
+                # Leader and member rows fused into one UNION query so each
+                # team keeps its leader-first ordering without per-team fetches
+                with db_connection() as db:
+                    for row in db.execute(
+                        'SELECT t.name AS team_name, t.team_code, \'Leader\' AS role, u.name AS name, u.phone AS phone, u.class_section AS class_section, 0 AS role_order '
+                        'FROM teams t JOIN users u ON u.id = t.leader_user_id WHERE t.game_id = ? '
+                        'UNION ALL '
+                        'SELECT t.name, t.team_code, \'Member\', u.name, u.phone, u.class_section, 1 '
+                        'FROM team_members tm JOIN users u ON u.id = tm.user_id JOIN teams t ON t.id = tm.team_id WHERE t.game_id = ? '
+                        'ORDER BY team_name, role_order, name',
+                        (game_id, game_id),
+                    ):
+                        yield emit([game['name'], row['team_name'], row['team_code'], row['role'], row['name'], row['phone'], row['class_section'] or ''])
 
-        mem = BytesIO()
-        mem.write(output.getvalue().encode('utf-8'))
-        mem.seek(0)
         safe_name = str(game['name']).replace(' ', '_')
         filename = f"{safe_name}_participants_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        return send_file(mem, mimetype='text/csv', as_attachment=True, download_name=filename)
+        return Response(
+            stream_with_context(codecs.iterencode(generate(), 'utf-8')),
+            mimetype='text/csv',
+            headers={'Content-Disposition': f'attachment; filename={filename}'},
+        )
 
     @app.route('/admin/team/create', methods=['POST'])
     def admin_create_team():
@@ -1097,8 +1681,15 @@ def register_routes(app: Flask) -> None:
                 max_additional = expected - 1
                 flash(f'This game allows at most {expected} members per team (leader + up to {max_additional}).', 'danger')
                 return redirect(url_for('dashboard'))
+        # Fetch leader and members with one batched lookup, then validate in Python
+        all_phones = [leader_phone] + member_phones
+        in_clause = ','.join([PH] * len(all_phones))
+        by_phone = {
+            r['phone']: r
+            for r in g.db.execute(f'SELECT * FROM users WHERE phone IN ({in_clause})', tuple(all_phones)).fetchall()
+        }
         # Validate leader
-        leader = g.db.execute('SELECT * FROM users WHERE phone = ?', (leader_phone,)).fetchone()
+        leader = by_phone.get(leader_phone)
         if not leader:
             flash('Leader phone not found. Ensure the user has signed up.', 'danger')
             return redirect(url_for('dashboard'))
@@ -1108,7 +1699,7 @@ def register_routes(app: Flask) -> None:
         # Validate members
         members: List[sqlite3.Row] = []
         for phone in member_phones:
-            row = g.db.execute('SELECT * FROM users WHERE phone = ?', (phone,)).fetchone()
+            row = by_phone.get(phone)
             if not row:
                 flash(f'Member with phone {phone} not found. Ask them to sign up first.', 'danger')
                 return redirect(url_for('dashboard'))
@@ -1123,22 +1714,18 @@ def register_routes(app: Flask) -> None:
         # Create team and assign
         cur = g.db.cursor()
         team_code = generate_team_code()
-        
-        if USING_POSTGRES:
-            cur.execute('INSERT INTO teams (name, leader_user_id, game_id, team_code) VALUES (%s,%s,%s,%s) RETURNING id', 
-                      (team_name, leader['id'], game_id, team_code))
-            team_id = cur.fetchone()['id']
-        else:
-            cur.execute('INSERT INTO teams (name, leader_user_id, game_id, team_code) VALUES (?,?,?,?)', 
-                      (team_name, leader['id'], game_id, team_code))
-            team_id = cur.lastrowid
-        # Assign leader
-        cur.execute('UPDATE users SET game_id = ?, team_id = ? WHERE id = ?', (game_id, team_id, leader['id']))
-        # Add members
-        for m in members:
-            cur.execute('INSERT INTO team_members (team_id, user_id) VALUES (?,?)', (team_id, m['id']))
-            cur.execute('UPDATE users SET game_id = ?, team_id = ? WHERE id = ?', (game_id, team_id, m['id']))
+        team_id = insert_team(cur, team_name, leader['id'], game_id, team_code)
+        # Add members and assign everyone in two batched statements
+        cur.executemany(
+            'INSERT INTO team_members (team_id, user_id) VALUES (?,?)',
+            [(team_id, m['id']) for m in members],
+        )
+        cur.executemany(
+            'UPDATE users SET game_id = ?, team_id = ? WHERE id = ?',
+            [(game_id, team_id, leader['id'])] + [(game_id, team_id, m['id']) for m in members],
+        )
         g.db.commit()
+        invalidate_admin_cache('overview_counts', 'participants_overview')
         flash(f'Team created successfully. Team Code: {team_code}', 'success')
         return redirect(url_for('dashboard'))
 
@@ -1168,6 +1755,7 @@ def register_routes(app: Flask) -> None:
             return redirect(url_for('dashboard'))
         g.db.execute('UPDATE users SET game_id = ?, team_id = NULL WHERE id = ?', (game_id, target['id']))
         g.db.commit()
+        invalidate_admin_cache('overview_counts', 'participants_overview')
         flash('Participant added to the game.', 'success')
         return redirect(url_for('dashboard'))
 
@@ -1202,19 +1790,25 @@ def register_routes(app: Flask) -> None:
             flash('User is already registered in another game.', 'danger')
             return redirect(url_for('admin'))
         
-        # Check if team is full (if team size is configured)
+        # Add member to team
+        cur = g.db.cursor()
         if game['team_size'] is not None:
-            current_members = g.db.execute('SELECT COUNT(1) FROM team_members WHERE team_id = ?', (team['id'],)).fetchone()[0]
-            leader_count = 1  # Leader is always counted
-            if current_members + leader_count >= int(game['team_size']):
+            # Conditional insert: the row only lands while the team (leader
+            # included) still has room, so there is no separate COUNT query
+            # and no race between checking capacity and inserting
+            cur.execute(
+                'INSERT INTO team_members (team_id, user_id) '
+                'SELECT ?, ? WHERE (SELECT COUNT(*) FROM team_members WHERE team_id = ?) + 1 < ?',
+                (team['id'], member['id'], team['id'], int(game['team_size'])),
+            )
+            if cur.rowcount == 0:
                 flash('This team is full.', 'warning')
                 return redirect(url_for('admin'))
-        
-        # Add member to team
-        cur = g.db.cursor()
-        cur.execute('INSERT INTO team_members (team_id, user_id) VALUES (?,?)', (team['id'], member['id']))
+        else:
+            cur.execute('INSERT INTO team_members (team_id, user_id) VALUES (?,?)', (team['id'], member['id']))
         cur.execute('UPDATE users SET game_id = ?, team_id = ? WHERE id = ?', (team['game_id'], team['id'], member['id']))
         g.db.commit()
+        invalidate_admin_cache('overview_counts', 'participants_overview')
         flash(f'Successfully added {member["name"]} to team "{team["name"]}".', 'success')
         return redirect(url_for('admin', tab='addmember'))
 
@@ -1227,10 +1821,8 @@ def register_routes(app: Flask) -> None:
         # If user is leader of a team, delete team and unassign all members
         team = g.db.execute('SELECT * FROM teams WHERE leader_user_id = ?', (user_id,)).fetchone()
         if team:
-            member_ids = [r['user_id'] for r in g.db.execute('SELECT user_id FROM team_members WHERE team_id = ?', (team['id'],)).fetchall()]
-            for mid in member_ids:
-                g.db.execute('UPDATE users SET game_id = NULL, team_id = NULL WHERE id = ?', (mid,))
-            g.db.execute('UPDATE users SET game_id = NULL, team_id = NULL WHERE id = ?', (team['leader_user_id'],))
+            # One set-based UPDATE unassigns the leader and every member
+            g.db.execute('UPDATE users SET game_id = NULL, team_id = NULL WHERE team_id = ?', (team['id'],))
             g.db.execute('DELETE FROM team_members WHERE team_id = ?', (team['id'],))
             g.db.execute('DELETE FROM teams WHERE id = ?', (team['id'],))
         else:
@@ -1238,6 +1830,7 @@ def register_routes(app: Flask) -> None:
             g.db.execute('DELETE FROM team_members WHERE user_id = ?', (user_id,))
             g.db.execute('UPDATE users SET game_id = NULL, team_id = NULL WHERE id = ?', (user_id,))
         g.db.commit()
+        invalidate_admin_cache('overview_counts', 'participants_overview')
         flash('Participant removed.', 'success')
         # Preserve tab if provided (e.g., gamesctl)
         tab = request.args.get('tab') or 'overview'
@@ -1252,10 +1845,8 @@ def register_routes(app: Flask) -> None:
             # If user is leader of a team, delete team and unassign all members
             team = g.db.execute('SELECT * FROM teams WHERE leader_user_id = ?', (user_id,)).fetchone()
             if team:
-                member_ids = [r['user_id'] for r in g.db.execute('SELECT user_id FROM team_members WHERE team_id = ?', (team['id'],)).fetchall()]
-                for mid in member_ids:
-                    g.db.execute('UPDATE users SET game_id = NULL, team_id = NULL WHERE id = ?', (mid,))
-                g.db.execute('UPDATE users SET game_id = NULL, team_id = NULL WHERE id = ?', (team['leader_user_id'],))
+                # One set-based UPDATE unassigns the leader and every member
+                g.db.execute('UPDATE users SET game_id = NULL, team_id = NULL WHERE team_id = ?', (team['id'],))
                 g.db.execute('DELETE FROM team_members WHERE team_id = ?', (team['id'],))
                 g.db.execute('DELETE FROM teams WHERE id = ?', (team['id'],))
             else:
@@ -1263,6 +1854,7 @@ def register_routes(app: Flask) -> None:
                 g.db.execute('DELETE FROM team_members WHERE user_id = ?', (user_id,))
                 g.db.execute('UPDATE users SET game_id = NULL, team_id = NULL WHERE id = ?', (user_id,))
             g.db.commit()
+            invalidate_admin_cache('overview_counts', 'participants_overview')
             return {"success": True}
         except Exception as e:
             g.db.rollback()
@@ -1287,9 +1879,8 @@ def register_routes(app: Flask) -> None:
             # If user is leader of a team, delete team and unassign all members
             team = g.db.execute('SELECT * FROM teams WHERE leader_user_id = ?', (user_id,)).fetchone()
             if team:
-                member_ids = [r['user_id'] for r in g.db.execute('SELECT user_id FROM team_members WHERE team_id = ?', (team['id'],)).fetchall()]
-                for mid in member_ids:
-                    g.db.execute('UPDATE users SET game_id = NULL, team_id = NULL WHERE id = ?', (mid,))
+                # One set-based UPDATE unassigns every member of the team
+                g.db.execute('UPDATE users SET game_id = NULL, team_id = NULL WHERE team_id = ?', (team['id'],))
                 g.db.execute('DELETE FROM team_members WHERE team_id = ?', (team['id'],))
                 g.db.execute('DELETE FROM teams WHERE id = ?', (team['id'],))
             
@@ -1303,12 +1894,11 @@ def register_routes(app: Flask) -> None:
                 if user_exists:
                     phone = user_exists['phone']
                     g.db.execute('DELETE FROM users WHERE id = ?', (user_id,))
-                    # Only delete from allowed_users if it exists
-                    allowed_exists = g.db.execute('SELECT 1 FROM allowed_users WHERE phone = ?', (phone,)).fetchone()
-                    if allowed_exists:
-                        g.db.execute('DELETE FROM allowed_users WHERE phone = ?', (phone,))
-                    
+                    # DELETE is a no-op when the row is absent; no probe needed
+                    g.db.execute('DELETE FROM allowed_users WHERE phone = ?', (phone,))
+
                     g.db.commit()
+                    invalidate_admin_cache('allowed_list', 'overview_counts', 'participants_overview')
                     return {"success": True, "message": f"User {phone} deleted successfully"}
                 else:
                     return {"error": "User not found"}, 404
@@ -1341,17 +1931,20 @@ def register_routes(app: Flask) -> None:
             if exists:
                 flash('Another user already has this phone number.', 'danger')
                 return redirect(url_for('admin'))
-            g.db.execute('UPDATE users SET name = ?, phone = ?, password = ?, class_section = ? WHERE id = ?', (name, phone, password, class_section, user_id))
-            # Sync allowed_users. If there is a row for original_phone, update it; else upsert by new phone
-            row = g.db.execute('SELECT id FROM allowed_users WHERE phone = ?', (original_phone or phone,)).fetchone()
-            if row:
-                g.db.execute('UPDATE allowed_users SET name = ?, phone = ?, password = ? WHERE id = ?', (name, phone, password, row['id']))
-            else:
-                # insert if not exists for new phone
-                exists_new = g.db.execute('SELECT id FROM allowed_users WHERE phone = ?', (phone,)).fetchone()
-                if not exists_new:
-                    g.db.execute('INSERT INTO allowed_users (name, phone, password, is_admin) VALUES (?,?,?,0)', (name, phone, password))
-            g.db.commit()
+            with admin_tx():
+                g.db.execute('UPDATE users SET name = ?, phone = ?, password = ?, class_section = ? WHERE id = ?', (name, phone, password, class_section, user_id))
+                # Sync allowed_users without SELECT probes: try to update the
+                # row for original_phone (handles phone changes, keeps
+                # is_admin); if none matched, upsert by the new phone.
+                cur = g.db.cursor()
+                cur.execute('UPDATE allowed_users SET name = ?, phone = ?, password = ? WHERE phone = ?',
+                            (name, phone, password, original_phone or phone))
+                if cur.rowcount == 0:
+                    cur.execute(
+                        'INSERT INTO allowed_users (name, phone, password, is_admin) VALUES (?,?,?,0) '
+                        'ON CONFLICT(phone) DO UPDATE SET name = excluded.name, password = excluded.password',
+                        (name, phone, password))
+            invalidate_admin_cache('allowed_list', 'participants_overview')
             flash('User updated.', 'success')
         except Exception as e:
             g.db.rollback()
@@ -1365,13 +1958,16 @@ def register_routes(app: Flask) -> None:
             flash('Admin access required.', 'danger')
             return redirect(url_for('login'))
         leader = g.db.execute('SELECT leader_user_id FROM teams WHERE id = ?', (team_id,)).fetchone()
-        if leader:
-            g.db.execute('UPDATE users SET game_id = NULL, team_id = NULL WHERE id = ?', (leader['leader_user_id'],))
-        for row in g.db.execute('SELECT user_id FROM team_members WHERE team_id = ?', (team_id,)).fetchall():
-            g.db.execute('UPDATE users SET game_id = NULL, team_id = NULL WHERE id = ?', (row['user_id'],))
-        g.db.execute('DELETE FROM team_members WHERE team_id = ?', (team_id,))
-        g.db.execute('DELETE FROM teams WHERE id = ?', (team_id,))
-        g.db.commit()
+        with admin_tx():
+            # One set-based UPDATE covers the leader and every member
+            g.db.execute(
+                'UPDATE users SET game_id = NULL, team_id = NULL '
+                'WHERE id IN (SELECT user_id FROM team_members WHERE team_id = ?) OR id = ?',
+                (team_id, leader['leader_user_id'] if leader else -1),
+            )
+            g.db.execute('DELETE FROM team_members WHERE team_id = ?', (team_id,))
+            g.db.execute('DELETE FROM teams WHERE id = ?', (team_id,))
+        invalidate_admin_cache('overview_counts', 'participants_overview')
         flash('Team deleted.', 'success')
         tab = request.args.get('tab') or 'gamesctl'
         return redirect(url_for('admin', tab=tab))
@@ -1382,13 +1978,12 @@ def register_routes(app: Flask) -> None:
         if not user or not user['is_admin']:
             flash('Admin access required.', 'danger')
             return redirect(url_for('login'))
-        g.db.execute('UPDATE users SET game_id = NULL, team_id = NULL WHERE game_id = ?', (game_id,))
-        team_ids = [r['id'] for r in g.db.execute('SELECT id FROM teams WHERE game_id = ?', (game_id,)).fetchall()]
-        for tid in team_ids:
-            g.db.execute('DELETE FROM team_members WHERE team_id = ?', (tid,))
-        g.db.execute('DELETE FROM teams WHERE game_id = ?', (game_id,))
-        g.db.execute('DELETE FROM games WHERE id = ?', (game_id,))
-        g.db.commit()
+        with admin_tx():
+            g.db.execute('UPDATE users SET game_id = NULL, team_id = NULL WHERE game_id = ?', (game_id,))
+            g.db.execute('DELETE FROM team_members WHERE team_id IN (SELECT id FROM teams WHERE game_id = ?)', (game_id,))
+            g.db.execute('DELETE FROM teams WHERE game_id = ?', (game_id,))
+            g.db.execute('DELETE FROM games WHERE id = ?', (game_id,))
+        invalidate_admin_cache('games', 'overview_counts')
         flash('Game deleted.', 'success')
         tab = request.args.get('tab') or 'gamesctl'
         return redirect(url_for('admin', tab=tab))
@@ -1400,12 +1995,21 @@ def register_routes(app: Flask) -> None:
             flash('Admin access required.', 'danger')
             return redirect(url_for('login'))
         try:
-            # Remove team memberships and teams
-            g.db.execute('DELETE FROM team_members')
-            g.db.execute('DELETE FROM teams')
-            # Delete all non-admin users
-            g.db.execute('DELETE FROM users WHERE is_admin = 0')
-            g.db.commit()
+            # Table-wide truncations: remove memberships, teams, then all
+            # non-admin users, submitted as one batch
+            stmts = [
+                'DELETE FROM team_members',
+                'DELETE FROM teams',
+                'DELETE FROM users WHERE is_admin = 0',
+            ]
+            if USING_POSTGRES:
+                with admin_tx():
+                    for stmt in stmts:
+                        g.db.execute(stmt)
+            else:
+                # One C-level call runs the whole script in one transaction
+                g.db.executescript('BEGIN IMMEDIATE;' + ';'.join(stmts) + ';COMMIT;')
+            invalidate_admin_cache()
             flash('All participants removed. Admin accounts preserved. Games/whitelist unchanged.', 'success')
         except Exception as e:
             g.db.rollback()
@@ -1419,20 +2023,24 @@ def register_routes(app: Flask) -> None:
             flash('Admin access required.', 'danger')
             return redirect(url_for('login'))
         try:
-            # Remove all team memberships and teams
-            g.db.execute('DELETE FROM team_members')
-            g.db.execute('DELETE FROM teams')
-            # Unassign any remaining users from games/teams just in case
-            g.db.execute('UPDATE users SET game_id = NULL, team_id = NULL')
-            # Remove all games
-            g.db.execute('DELETE FROM games')
-            # Remove all non-admin users
-            g.db.execute('DELETE FROM users WHERE is_admin = 0')
-            # Keep only admin rows in allowed_users
-            g.db.execute('DELETE FROM allowed_users WHERE is_admin = 0')
-            # Clear whitelist entirely
-            g.db.execute('DELETE FROM whitelist_phones')
-            g.db.commit()
+            # Full reset minus admin rows: memberships, teams, user
+            # assignments, games, non-admin users/credentials, whitelist
+            stmts = [
+                'DELETE FROM team_members',
+                'DELETE FROM teams',
+                'UPDATE users SET game_id = NULL, team_id = NULL',
+                'DELETE FROM games',
+                'DELETE FROM users WHERE is_admin = 0',
+                'DELETE FROM allowed_users WHERE is_admin = 0',
+                'DELETE FROM whitelist_phones',
+            ]
+            if USING_POSTGRES:
+                with admin_tx():
+                    for stmt in stmts:
+                        g.db.execute(stmt)
+            else:
+                g.db.executescript('BEGIN IMMEDIATE;' + ';'.join(stmts) + ';COMMIT;')
+            invalidate_admin_cache()
             flash('All data cleared except admin accounts.', 'success')
         except Exception as e:
             g.db.rollback()
@@ -1462,37 +2070,38 @@ def register_routes(app: Flask) -> None:
             flash('Admin access required.', 'danger')
             return redirect(url_for('login'))
 
-        games = g.db.execute('SELECT * FROM games ORDER BY name').fetchall()
+        # Plain dicts for the template: Jinja key access on sqlite3.Row is a
+        # linear column scan, on dict a hash lookup
+        games = [dict(r) for r in g.db.execute('SELECT id, name, type FROM games ORDER BY name')]
         per_game: Dict[int, Dict[str, Any]] = {}
         for gr in games:
             entry: Dict[str, Any] = {'game': gr}
             if gr['type'] == 'single':
-                participants = g.db.execute(
+                participants = [dict(r) for r in g.db.execute(
                     'SELECT u.name, u.phone, u.class_section FROM users u WHERE u.game_id = ? AND (u.team_id IS NULL) ORDER BY u.name',
                     (gr['id'],),
-                ).fetchall()
+                )]
                 entry['participants'] = participants
             else:
-                teams = g.db.execute(
+                teams = [dict(t) for t in g.db.execute(
                     'SELECT t.id, t.name, t.team_code, u.name AS leader_name, u.phone AS leader_phone, u.class_section AS leader_class_section '
                     'FROM teams t JOIN users u ON u.id = t.leader_user_id WHERE t.game_id = ? ORDER BY t.name',
                     (gr['id'],),
-                ).fetchall()
-                # members per team
+                )]
+                # Members for all teams in one IN query per 900-id slice
+                # (SQLite caps bound parameters), bucketed by team_id here
                 team_ids = [t['id'] for t in teams]
-                members_map: Dict[int, List[sqlite3.Row]] = {}
-                if team_ids:
-                    # Use a more compatible approach for both SQLite and PostgreSQL
-                    placeholder = '%s' if USING_POSTGRES else '?'
-                    
-                    for team_id in team_ids:
-                        rows = g.db.execute(
-                            f'SELECT tm.team_id, u.name, u.phone, u.class_section FROM team_members tm JOIN users u ON u.id = tm.user_id '
-                            f'WHERE tm.team_id = {placeholder} ORDER BY u.name',
-                            (team_id,)
-                        ).fetchall()
-                        for r in rows:
-                            members_map.setdefault(r['team_id'], []).append(r)
+                members_map: Dict[int, List[Dict[str, Any]]] = {}
+                for start in range(0, len(team_ids), 900):
+                    chunk = team_ids[start:start + 900]
+                    rows = g.db.execute(
+                        'SELECT tm.team_id, u.name, u.phone, u.class_section FROM team_members tm '
+                        'JOIN users u ON u.id = tm.user_id '
+                        'WHERE tm.team_id IN ({}) ORDER BY tm.team_id, u.name'.format(','.join([PH] * len(chunk))),
+                        tuple(chunk),
+                    )
+                    for r in rows:
+                        members_map.setdefault(r['team_id'], []).append(dict(r))
                 entry['teams'] = teams
                 entry['members_map'] = members_map
             per_game[gr['id']] = entry
@@ -1507,116 +2116,69 @@ def register_routes(app: Flask) -> None:
             return redirect(url_for('login'))
 
         try:
-            # Lazy import to avoid requirement when unused
-            from reportlab.lib.pagesizes import A4
-            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-            from reportlab.lib.units import mm
-            from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
-            from reportlab.lib import colors
+            # Availability probe only; the builder imports what it needs
+            import reportlab
         except Exception:
             flash('PDF generation library not installed. Please install reportlab.', 'danger')
             return redirect(url_for('admin'))
 
-        games = g.db.execute('SELECT * FROM games ORDER BY name').fetchall()
-
-        buf = BytesIO()
-        doc = SimpleDocTemplate(buf, pagesize=A4, leftMargin=14*mm, rightMargin=14*mm, topMargin=16*mm, bottomMargin=16*mm)
-        styles = getSampleStyleSheet()
-        elements: List[Any] = []
-
-        title_style = styles['Title']
-        subtitle_style = ParagraphStyle('SubTitle', parent=styles['Heading2'], spaceAfter=6)
-        table_header_bg = colors.Color(0.92, 0.92, 0.92)
-
-        elements.append(Paragraph('Participants List (by Game)', title_style))
-        elements.append(Spacer(1, 6))
-        generated_on = datetime.now().strftime('%Y-%m-%d %H:%M')
-        elements.append(Paragraph(f'Generated on: {generated_on}', styles['Normal']))
-        elements.append(Spacer(1, 12))
-
-        for idx_game, gr in enumerate(games):
-            # Game header
-            subtitle = f"{gr['name']}  —  {gr['type'].upper()}"
-            elements.append(Paragraph(subtitle, subtitle_style))
-
-            if gr['type'] == 'single':
-                rows = [["#", "Name", "Phone", "Class/Section"]]
-                participants = g.db.execute(
-                    'SELECT u.name, u.phone, u.class_section FROM users u WHERE u.game_id = ? AND (u.team_id IS NULL) ORDER BY u.name',
-                    (gr['id'],),
-                ).fetchall()
-                for idx, p in enumerate(participants, start=1):
-                    rows.append([str(idx), p['name'], p['phone'], p['class_section'] or '-'])
-                if len(rows) == 1:
-                    rows.append(['-', 'No participants', '', ''])
-                table = Table(rows, repeatRows=1, colWidths=[12*mm, None, 32*mm, 32*mm])
-                table.setStyle(TableStyle([
-                    ('BACKGROUND', (0,0), (-1,0), table_header_bg),
-                    ('GRID', (0,0), (-1,-1), 0.25, colors.grey),
-                    ('ALIGN', (0,0), (0,-1), 'CENTER'),
-                    ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-                    ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-                ]))
-                elements.append(table)
-                elements.append(Spacer(1, 10))
-            else:
-                # Team game
-                teams = g.db.execute(
-                    'SELECT t.id, t.name, t.team_code, u.name AS leader_name, u.phone AS leader_phone, u.class_section AS leader_class_section '
-                    'FROM teams t JOIN users u ON u.id = t.leader_user_id WHERE t.game_id = ? ORDER BY t.name',
-                    (gr['id'],),
-                ).fetchall()
-                if not teams:
-                    rows = [["-", "No teams", "", "", ""]]
-                    table = Table(rows, colWidths=[12*mm, None, 28*mm, 28*mm, 28*mm])
-                    elements.append(table)
-                    elements.append(Spacer(1, 8))
-                else:
-                    # Render each team with its own members table for clarity
-                    for t_idx, t in enumerate(teams, start=1):
-                        header = f"{t_idx}. Team: {t['name']}  (Code: {t['team_code']})"
-                        elements.append(Paragraph(header, styles['Heading3']))
-
-                        leader_rows = [["Leader", t['leader_name'], t['leader_phone'], t['leader_class_section'] or '-']]
-                        leader_table = Table(leader_rows, colWidths=[20*mm, None, 32*mm, 32*mm])
-                        leader_table.setStyle(TableStyle([
-                            ('BACKGROUND', (0,0), (0,0), table_header_bg),
-                            ('GRID', (0,0), (-1,-1), 0.25, colors.grey),
-                            ('FONTNAME', (0,0), (0,0), 'Helvetica-Bold'),
-                            ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-                        ]))
-                        elements.append(leader_table)
-
-                        member_header = [["#", "Member Name", "Phone", "Class/Section"]]
-                        members = g.db.execute(
-                            'SELECT u.name, u.phone, u.class_section FROM team_members tm JOIN users u ON u.id = tm.user_id WHERE tm.team_id = ? ORDER BY u.name',
-                            (t['id'],),
-                        ).fetchall()
-                        member_rows = list(member_header)
-                        for midx, m in enumerate(members, start=1):
-                            member_rows.append([str(midx), m['name'], m['phone'], m['class_section'] or '-'])
-                        if len(member_rows) == 1:
-                            member_rows.append(['-', 'No members yet', '', ''])
-                        member_table = Table(member_rows, repeatRows=1, colWidths=[12*mm, None, 32*mm, 32*mm])
-                        member_table.setStyle(TableStyle([
-                            ('BACKGROUND', (0,0), (-1,0), table_header_bg),
-                            ('GRID', (0,0), (-1,-1), 0.25, colors.grey),
-                            ('ALIGN', (0,0), (0,-1), 'CENTER'),
-                            ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-                            ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-                        ]))
-                        elements.append(member_table)
-                        elements.append(Spacer(1, 8))
-
-            # Page break between games for cleaner print, except after the last
-            if idx_game < len(games) - 1:
-                elements.append(PageBreak())
+        games = g.db.execute('SELECT id, name, type FROM games ORDER BY name').fetchall()
+        # Nothing to render: skip the prefetch queries and the ReportLab build
+        if not games:
+            flash('No games configured yet; nothing to export.', 'warning')
+            return redirect(url_for('admin', tab='gamesctl'))
 
-        doc.build(elements)
+        # Prefetch all three result sets up front and bucket by game/team as
+        # plain dicts, so rendering needs no DB handle and the data can be
+        # pickled across to a worker process.
+        games = [dict(r) for r in games]
+        parts_by_game: Dict[int, List[Dict[str, Any]]] = {}
+        for r in g.db.execute(SQL_EXPORT_SINGLES):
+            parts_by_game.setdefault(r['game_id'], []).append(dict(r))
+        teams_by_game: Dict[int, List[Dict[str, Any]]] = {}
+        for r in g.db.execute(SQL_EXPORT_TEAMS):
+            teams_by_game.setdefault(r['game_id'], []).append(dict(r))
+        members_by_team: Dict[int, List[Dict[str, Any]]] = {}
+        for r in g.db.execute(SQL_EXPORT_MEMBERS):
+            members_by_team.setdefault(r['team_id'], []).append(dict(r))
+
+        # Optional background render: ?async=1 hands the CPU-bound build to
+        # the worker pool and returns a job id for the status route below.
+        if request.args.get('async'):
+            job_id = secrets.token_hex(8)
+            future = get_pdf_executor().submit(
+                build_participants_pdf_bytes, games, parts_by_game, teams_by_game, members_by_team
+            )
+            with _PDF_JOBS_LOCK:
+                _PDF_JOBS[job_id] = future
+            return {"job_id": job_id, "status_url": url_for('admin_export_pdf_status', job_id=job_id)}
+
+        # Spool to disk past 2MB so a large event doesn't hold the whole
+        # document in memory while ReportLab builds it
+        buf = tempfile.SpooledTemporaryFile(max_size=2 * 1024 * 1024, mode='w+b')
+        build_participants_pdf(buf, games, parts_by_game, teams_by_game, members_by_team)
         buf.seek(0)
         filename = f"participants_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
         return send_file(buf, mimetype='application/pdf', as_attachment=True, download_name=filename)
 
+    @app.route('/admin/export-pdf/status/<job_id>')
+    def admin_export_pdf_status(job_id: str):
+        user = fetch_current_user()
+        if not user or not user['is_admin']:
+            flash('Admin access required.', 'danger')
+            return redirect(url_for('login'))
+        with _PDF_JOBS_LOCK:
+            future = _PDF_JOBS.get(job_id)
+        if future is None:
+            return {"error": "Unknown job."}, 404
+        if not future.done():
+            return {"status": "pending"}
+        with _PDF_JOBS_LOCK:
+            _PDF_JOBS.pop(job_id, None)
+        pdf_bytes = future.result()
+        filename = f"participants_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+        return send_file(BytesIO(pdf_bytes), mimetype='application/pdf', as_attachment=True, download_name=filename)
+
     @app.route('/admin/export-pdf/<int:game_id>')
     def admin_export_game_pdf(game_id: int):
         user = fetch_current_user()
@@ -1626,93 +2188,42 @@ def register_routes(app: Flask) -> None:
 
         try:
             from reportlab.lib.pagesizes import A4
-            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
             from reportlab.lib.units import mm
-            from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-            from reportlab.lib import colors
+            from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
         except Exception:
             flash('PDF generation library not installed. Please install reportlab.', 'danger')
             return redirect(url_for('admin'))
+        pdf = get_pdf_styles()
 
-        game = g.db.execute('SELECT * FROM games WHERE id = ?', (game_id,)).fetchone()
+        game = g.db.execute('SELECT id, name, type FROM games WHERE id = ?', (game_id,)).fetchone()
         if not game:
             flash('Game not found.', 'danger')
             return redirect(url_for('admin', tab='gamesctl'))
 
-        buf = BytesIO()
+        buf = tempfile.SpooledTemporaryFile(max_size=2 * 1024 * 1024, mode='w+b')
         doc = SimpleDocTemplate(buf, pagesize=A4, leftMargin=14*mm, rightMargin=14*mm, topMargin=16*mm, bottomMargin=16*mm)
-        styles = getSampleStyleSheet()
-        title_style = styles['Title']
-        subtitle_style = ParagraphStyle('SubTitle', parent=styles['Heading2'], spaceAfter=6)
-        table_header_bg = colors.Color(0.92, 0.92, 0.92)
+        styles = pdf['styles']
 
         elements: List[Any] = []
-        elements.append(Paragraph('Participants List (Single Game)', title_style))
+        elements.append(Paragraph('Participants List (Single Game)', pdf['title']))
         elements.append(Spacer(1, 6))
-        elements.append(Paragraph(f"Game: {game['name']} ({game['type'].upper()})", subtitle_style))
+        elements.append(Paragraph(f"Game: {game['name']} ({game['type'].upper()})", pdf['subtitle']))
         elements.append(Spacer(1, 8))
 
         if game['type'] == 'single':
-            rows = [["#", "Name", "Phone", "Class/Section"]]
-            participants = g.db.execute(
-                'SELECT u.name, u.phone, u.class_section FROM users u WHERE u.game_id = ? AND (u.team_id IS NULL) ORDER BY u.name',
-                (game_id,),
-            ).fetchall()
-            for idx, p in enumerate(participants, start=1):
-                rows.append([str(idx), p['name'], p['phone'], p['class_section'] or '-'])
-            if len(rows) == 1:
-                rows.append(['-', 'No participants', '', ''])
-            table = Table(rows, repeatRows=1, colWidths=[12*mm, None, 32*mm, 32*mm])
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0,0), (-1,0), table_header_bg),
-                ('GRID', (0,0), (-1,-1), 0.25, colors.grey),
-                ('ALIGN', (0,0), (0,-1), 'CENTER'),
-                ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-                ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-            ]))
-            elements.append(table)
+            # The cursor streams straight into the table builder; no
+            # intermediate list of the whole game's participants
+            participants = g.db.execute(SQL_GAME_SINGLES, (game_id,))
+            append_participants_table(elements, participants)
         else:
-            teams = g.db.execute(
-                'SELECT t.id, t.name, t.team_code, u.name AS leader_name, u.phone AS leader_phone, u.class_section AS leader_class_section '
-                'FROM teams t JOIN users u ON u.id = t.leader_user_id WHERE t.game_id = ? ORDER BY t.name',
-                (game_id,),
-            ).fetchall()
+            teams = g.db.execute(SQL_GAME_TEAMS, (game_id,)).fetchall()
             if not teams:
                 elements.append(Paragraph('No teams.', styles['Normal']))
             else:
-                for t_idx, t in enumerate(teams, start=1):
-                    header = f"{t_idx}. Team: {t['name']}  (Code: {t['team_code']})"
-                    elements.append(Paragraph(header, styles['Heading3']))
-                    leader_rows = [["Leader", t['leader_name'], t['leader_phone'], t['leader_class_section'] or '-']]
-                    leader_table = Table(leader_rows, colWidths=[20*mm, None, 32*mm, 32*mm])
-                    leader_table.setStyle(TableStyle([
-                        ('BACKGROUND', (0,0), (0,0), table_header_bg),
-                        ('GRID', (0,0), (-1,-1), 0.25, colors.grey),
-                        ('FONTNAME', (0,0), (0,0), 'Helvetica-Bold'),
-                        ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-                    ]))
-                    elements.append(leader_table)
-
-                    member_header = [["#", "Member Name", "Phone", "Class/Section"]]
-                    members = g.db.execute(
-                        'SELECT u.name, u.phone, u.class_section FROM team_members tm JOIN users u ON u.id = tm.user_id WHERE tm.team_id = ? ORDER BY u.name',
-                        (t['id'],),
-                    ).fetchall()
-                    member_rows = list(member_header)
-                    for midx, m in enumerate(members, start=1):
-                        member_rows.append([str(midx), m['name'], m['phone'], m['class_section'] or '-'])
-                    if len(member_rows) == 1:
-                        member_rows.append(['-', 'No members yet', '', ''])
-                    member_table = Table(member_rows, repeatRows=1, colWidths=[12*mm, None, 32*mm, 32*mm])
-                    member_table.setStyle(TableStyle([
-                        ('BACKGROUND', (0,0), (-1,0), table_header_bg),
-                        ('GRID', (0,0), (-1,-1), 0.25, colors.grey),
-                        ('ALIGN', (0,0), (0,-1), 'CENTER'),
-                        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-                        ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-                    ]))
-                    elements.append(member_table)
-                    elements.append(Spacer(1, 8))
+                members_by_team: Dict[int, List[sqlite3.Row]] = {}
+                for r in g.db.execute(SQL_GAME_MEMBERS, (game_id,)):
+                    members_by_team.setdefault(r['team_id'], []).append(r)
+                append_team_tables(elements, teams, members_by_team)
 
         doc.build(elements)
         buf.seek(0)
@@ -1740,18 +2251,19 @@ def register_routes(app: Flask) -> None:
                 flash('Phone number is not whitelisted. Contact admin.', 'danger')
                 return render_template('signup.html')
 
-            # Check if already registered
-            exists = g.db.execute('SELECT 1 FROM users WHERE phone = ?', (phone,)).fetchone()
-            if exists:
-                flash('This phone is already registered. Please login.', 'warning')
-                return redirect(url_for('login'))
-
-            # Create user
-            g.db.execute(
-                'INSERT INTO users (phone, password, name, class_section, is_admin) VALUES (?,?,?,?,0)',
+            # Create user; the unique phone constraint detects an existing
+            # registration in the same statement instead of a SELECT probe
+            cur = g.db.cursor()
+            cur.execute(
+                'INSERT INTO users (phone, password, name, class_section, is_admin) VALUES (?,?,?,?,0) '
+                'ON CONFLICT(phone) DO NOTHING',
                 (phone, password, name, class_section)
             )
+            if cur.rowcount == 0:
+                flash('This phone is already registered. Please login.', 'warning')
+                return redirect(url_for('login'))
             g.db.commit()
+            invalidate_admin_cache('participants_overview')
             flash('Signup successful. You can now login.', 'success')
             return redirect(url_for('login'))
 
@@ -1768,10 +2280,10 @@ def register_routes(app: Flask) -> None:
         # Get user's game information
         user_game = None
         if user['game_id']:
-            user_game = g.db.execute('SELECT * FROM games WHERE id = ?', (user['game_id'],)).fetchone()
+            user_game = g.db.execute('SELECT name FROM games WHERE id = ?', (user['game_id'],)).fetchone()
         
         # Get certificate settings
-        settings = g.db.execute('SELECT * FROM certificate_settings LIMIT 1').fetchone()
+        settings = get_cert_settings()
         certificates_enabled = settings and settings['certificates_enabled'] == 1
         
         return render_template(
@@ -1789,7 +2301,7 @@ def register_routes(app: Flask) -> None:
             return redirect(url_for('login'))
             
         # Check if certificates are enabled by admin
-        settings = g.db.execute('SELECT * FROM certificate_settings LIMIT 1').fetchone()
+        settings = get_cert_settings()
         certificates_enabled = settings and settings['certificates_enabled'] == 1
         
         if not certificates_enabled:
@@ -1801,13 +2313,13 @@ def register_routes(app: Flask) -> None:
             flash('You are not registered for any event. Please contact the administrator.', 'warning')
             return redirect(url_for('certificate'))
             
-        game = g.db.execute('SELECT * FROM games WHERE id = ?', (user['game_id'],)).fetchone()
+        game = g.db.execute('SELECT name FROM games WHERE id = ?', (user['game_id'],)).fetchone()
         
         # Get certificate settings
-        settings = g.db.execute('SELECT * FROM certificate_settings LIMIT 1').fetchone()
+        settings = get_cert_settings()
         
         # Get event date from settings
-        event_date = settings['event_date'] if settings and settings['event_date'] else datetime.now().strftime('%B %d, %Y')
+        event_date = settings['event_date'] if settings and settings['event_date'] else _today_str(date.today().toordinal())
         
         # Generate HTML certificate for event
         try:
@@ -1832,7 +2344,7 @@ def register_routes(app: Flask) -> None:
             return redirect(url_for('login'))
             
         # Check if certificates are enabled by admin
-        settings = g.db.execute('SELECT * FROM certificate_settings LIMIT 1').fetchone()
+        settings = get_cert_settings()
         certificates_enabled = settings and settings['certificates_enabled'] == 1
         
         if not certificates_enabled:
@@ -1844,13 +2356,13 @@ def register_routes(app: Flask) -> None:
             flash('You are not registered for any event. Please contact the administrator.', 'warning')
             return redirect(url_for('certificate'))
             
-        game = g.db.execute('SELECT * FROM games WHERE id = ?', (user['game_id'],)).fetchone()
+        game = g.db.execute('SELECT name FROM games WHERE id = ?', (user['game_id'],)).fetchone()
         
         # Get certificate settings
-        settings = g.db.execute('SELECT * FROM certificate_settings LIMIT 1').fetchone()
+        settings = get_cert_settings()
         
         # Get event date from settings
-        event_date = settings['event_date'] if settings and settings['event_date'] else datetime.now().strftime('%B %d, %Y')
+        event_date = settings['event_date'] if settings and settings['event_date'] else _today_str(date.today().toordinal())
         
         # Generate HTML certificate for seminar
         try:
@@ -1875,7 +2387,7 @@ def register_routes(app: Flask) -> None:
             return redirect(url_for('login'))
             
         # Get certificate settings
-        settings = g.db.execute('SELECT * FROM certificate_settings LIMIT 1').fetchone()
+        settings = get_cert_settings()
         
         # Get download records
         downloads = g.db.execute('''
@@ -1941,68 +2453,49 @@ def register_routes(app: Flask) -> None:
     @app.route('/certificate/preview')
     @app.route('/certificate/preview/<certificate_type>')
     def preview_certificate(certificate_type='event'):
-        user = fetch_current_user()
+        # Single JOIN query brings the game name along with the user row
+        user = fetch_current_user_with_game()
         if not user:
             flash('Please login to preview your certificate.', 'warning')
             return redirect(url_for('login'))
-            
+
         # Check if certificates are enabled
-        settings = g.db.execute('SELECT * FROM certificate_settings LIMIT 1').fetchone()
+        settings = get_cert_settings()
         certificates_enabled = settings and settings['certificates_enabled'] == 1
-        
+
         if not certificates_enabled:
             flash('Certificates are not yet available. Please check back later.', 'info')
             return redirect(url_for('certificate'))
-            
+
         # Get user's game information
         if not user['game_id']:
             flash('You are not registered for any event. Please contact the administrator.', 'warning')
             return redirect(url_for('certificate'))
-            
-        game = g.db.execute('SELECT * FROM games WHERE id = ?', (user['game_id'],)).fetchone()
-        
+
         # Get event date from settings
-        event_date = settings['event_date'] if settings and settings['event_date'] else datetime.now().strftime('%B %d, %Y')
+        event_date = settings['event_date'] if settings and settings['event_date'] else _today_str(date.today().toordinal())
         
         # Validate certificate type
-        if certificate_type not in ['event', 'seminar']:
+        if certificate_type not in VALID_CERT_TYPES:
             certificate_type = 'event'
         
-        # Generate HTML certificate for preview
+        # Generate HTML certificate for preview; the certificate body is
+        # memoized per argument set and the navigation chrome is a compiled
+        # Jinja template instead of a per-request f-string
         try:
-            certificate_html = generate_html_certificate(
-                student_name=user['name'],
-                event_name=game['name'],
-                event_date=event_date,
-                class_section=user['class_section'],
+            certificate_html = _cached_html_cert(
+                user['name'],
+                user['game_name'],
+                event_date,
+                user['class_section'],
+                certificate_type
+            )
+
+            navigation_html = render_template(
+                'certificate_preview_chrome.html',
                 certificate_type=certificate_type
             )
-            
-            # Add navigation and download buttons to the preview
-            navigation_html = f'''
-            <div style="position: fixed; top: 10px; left: 10px; z-index: 1000; background: white; padding: 15px; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); font-family: Arial, sans-serif;">
-                <h5 style="margin: 0 0 10px 0; color: #333;">Certificate Preview</h5>
-                <div style="margin-bottom: 10px;">
-                    <a href="{url_for('preview_certificate', certificate_type='event')}" 
-                       style="padding: 5px 10px; margin-right: 5px; text-decoration: none; background: {'#007bff' if certificate_type == 'event' else '#6c757d'}; color: white; border-radius: 4px; font-size: 12px;">Event Certificate</a>
-                    <a href="{url_for('preview_certificate', certificate_type='seminar')}" 
-                       style="padding: 5px 10px; text-decoration: none; background: {'#007bff' if certificate_type == 'seminar' else '#6c757d'}; color: white; border-radius: 4px; font-size: 12px;">Seminar Certificate</a>
-                </div>
-                <div>
-                    <a href="{url_for('download_single_certificate', certificate_type=certificate_type)}" 
-                       style="padding: 8px 15px; text-decoration: none; background: #28a745; color: white; border-radius: 4px; font-size: 12px; display: inline-block;">
-                       📥 Download This Certificate
-                    </a>
-                </div>
-                <div style="margin-top: 8px;">
-                    <a href="{url_for('certificate')}" 
-                       style="padding: 5px 10px; text-decoration: none; background: #6c757d; color: white; border-radius: 4px; font-size: 11px;">
-                       ← Back to Certificates
-                    </a>
-                </div>
-            </div>
-            '''
-            
+
             return navigation_html + certificate_html
         except Exception as e:
             print(f"Error generating certificate preview: {e}")
@@ -2011,69 +2504,74 @@ def register_routes(app: Flask) -> None:
     
     @app.route('/certificate/download/<certificate_type>')
     def download_single_certificate(certificate_type='event'):
-        user = fetch_current_user()
+        # Single JOIN query brings the game name along with the user row
+        user = fetch_current_user_with_game()
         if not user:
             flash('Please login to download your certificate.', 'warning')
             return redirect(url_for('login'))
-            
+
         # Check if certificates are enabled
-        settings = g.db.execute('SELECT * FROM certificate_settings LIMIT 1').fetchone()
+        settings = get_cert_settings()
         certificates_enabled = settings and settings['certificates_enabled'] == 1
-        
+
         if not certificates_enabled:
             flash('Certificates are not yet available. Please check back later.', 'info')
             return redirect(url_for('certificate'))
-            
+
         # Get user's game information
         if not user['game_id']:
             flash('You are not registered for any event. Please contact the administrator.', 'warning')
             return redirect(url_for('certificate'))
-            
-        game = g.db.execute('SELECT * FROM games WHERE id = ?', (user['game_id'],)).fetchone()
-        
+
         # Get event date from settings
-        event_date = settings['event_date'] if settings and settings['event_date'] else datetime.now().strftime('%B %d, %Y')
+        event_date = settings['event_date'] if settings and settings['event_date'] else _today_str(date.today().toordinal())
         
         # Validate certificate type
-        if certificate_type not in ['event', 'seminar']:
+        if certificate_type not in VALID_CERT_TYPES:
             certificate_type = 'event'
         
-        # Generate single certificate PDF
+        # Generate single certificate PDF (served from the on-disk cache on
+        # repeat downloads)
         try:
-            certificate_buffer = generate_certificate_pdf(
+            cache_key = (user['id'], user['game_name'], event_date,
+                         user['class_section'], certificate_type, cert_template_mtime())
+            certificate_buffer = BytesIO(cached_pdf(cache_key, lambda: generate_certificate_pdf(
                 student_name=user['name'],
-                event_name=game['name'],
+                event_name=user['game_name'],
                 event_date=event_date,
                 class_section=user['class_section'],
                 certificate_type=certificate_type
-            )
+            ).getvalue()))
         except Exception as e:
             print(f"Error generating certificate: {e}")
             flash('Error generating certificate. Please contact administrator.', 'danger')
             return redirect(url_for('certificate'))
         
-        # Record the download
+        # Record the first download; UNIQUE(user_id) makes repeats a no-op
         now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        download_record = g.db.execute('SELECT 1 FROM certificate_downloads WHERE user_id = ?', (user['id'],)).fetchone()
-        
-        if not download_record:
-            g.db.execute(
-                'INSERT INTO certificate_downloads (user_id, download_date) VALUES (?, ?)',
-                (user['id'], now)
-            )
-            g.db.commit()
+        g.db.execute(
+            'INSERT INTO certificate_downloads (user_id, download_date) VALUES (?, ?) '
+            'ON CONFLICT(user_id) DO NOTHING',
+            (user['id'], now)
+        )
+        g.db.commit()
         
         # Determine filename based on certificate type
         cert_type_name = 'Event' if certificate_type == 'event' else 'Seminar'
         filename = f"{user['name'].replace(' ', '_')}_{cert_type_name}_Certificate.pdf"
-        
-        # Send the certificate
-        return send_file(
+
+        # Send the certificate with an ETag derived from the cache key, so a
+        # matching If-None-Match re-download is answered 304 with no body
+        response = send_file(
             certificate_buffer,
             mimetype='application/pdf',
             as_attachment=True,
             download_name=filename
         )
+        response.set_etag(cert_cache_id(cache_key))
+        response.cache_control.private = True
+        response.cache_control.max_age = 3600
+        return response.make_conditional(request)
         
     @app.route('/admin/certificates/bulk-generate')
     def admin_bulk_generate_certificates():
@@ -2083,72 +2581,106 @@ def register_routes(app: Flask) -> None:
             return redirect(url_for('login'))
             
         # Get certificate settings
-        settings = g.db.execute('SELECT * FROM certificate_settings LIMIT 1').fetchone()
-        event_date = settings['event_date'] if settings and settings['event_date'] else datetime.now().strftime('%B %d, %Y')
+        settings = get_cert_settings()
+        event_date = settings['event_date'] if settings and settings['event_date'] else _today_str(date.today().toordinal())
         
-        # Create a temporary directory to store certificates
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Get all participants
-            participants = g.db.execute('''
-                SELECT u.id, u.name, u.class_section, g.name as game_name
-                FROM users u
-                LEFT JOIN games g ON g.id = u.game_id
-                WHERE u.game_id IS NOT NULL AND u.is_admin = 0
-                ORDER BY u.name
-            ''').fetchall()
-            
-            if not participants:
-                flash('No participants found to generate certificates for.', 'warning')
-                return redirect(url_for('admin', tab='certificates'))
-                
-            # Generate certificates for each participant
-            certificate_files = []
-            for p in participants:
-                if not p['game_name']:
-                    continue
-                    
-                file_name = f"certificate_{p['id']}_{p['name'].replace(' ', '_')}.pdf"
-                file_path = os.path.join(temp_dir, file_name)
-                
-                try:
-                    # Generate dual certificates for each participant
-                    dual_cert_buffer = generate_dual_certificates(
-                        student_name=p['name'],
-                        event_name=p['game_name'],
-                        event_date=event_date,
-                        class_section=p['class_section']
-                    )
-                    
-                    # Change file extension to .zip since we're now generating dual certificates
-                    file_name = f"certificates_{p['id']}_{p['name'].replace(' ', '_')}.zip"
-                    file_path = os.path.join(temp_dir, file_name)
-                    
-                    # Write to file
-                    with open(file_path, 'wb') as f:
-                        f.write(dual_cert_buffer.getvalue())
-                except Exception as e:
-                    print(f"Error generating certificates for {p['name']}: {e}")
-                    continue
-                
-                certificate_files.append(file_path)
-                
-            # Create a zip file containing all certificates
-            zip_buffer = BytesIO()
-            with zipfile.ZipFile(zip_buffer, 'w') as zip_file:
-                for file_path in certificate_files:
-                    file_name = os.path.basename(file_path)
-                    zip_file.write(file_path, file_name)
-                    
-            zip_buffer.seek(0)
-            
-            # Send the zip file
+        # Get all participants. Game names are batch-loaded into one dict
+        # rather than JOINed per row, which would duplicate the same name
+        # string for every participant of an event and fatten the tuples
+        # pickled to the worker processes.
+        games_by_id = {r['id']: r['name'] for r in g.db.execute('SELECT id, name FROM games')}
+        participants = g.db.execute('''
+            SELECT id, name, class_section, game_id FROM users
+            WHERE game_id IS NOT NULL AND is_admin = 0
+            ORDER BY name
+        ''').fetchall()
+
+        if not participants:
+            flash('No participants found to generate certificates for.', 'warning')
+            return redirect(url_for('admin', tab='certificates'))
+
+        if request.args.get('mode') == 'combined':
+            # One multi-page PDF from a single Canvas: the embedded template
+            # image is shared across pages instead of stored per participant
+            try:
+                from .certificate_generator import generate_all_certificates_pdf
+            except (ImportError, ValueError):
+                from certificate_generator import generate_all_certificates_pdf
+            pdf_buffer = generate_all_certificates_pdf(
+                [(p['name'], games_by_id[p['game_id']])
+                 for p in participants if p['game_id'] in games_by_id],
+                event_date
+            )
             return send_file(
-                zip_buffer,
-                mimetype='application/zip',
+                pdf_buffer,
+                mimetype='application/pdf',
                 as_attachment=True,
-                download_name=f"all_certificates_{datetime.now().strftime('%Y%m%d')}.zip"
+                download_name=f"all_certificates_{datetime.now().strftime('%Y%m%d')}.pdf"
             )
 
+        # Certificate rendering is pure-Python and CPU-bound, so a serial
+        # loop leaves every other core idle; fan the work out to a process
+        # pool and stream each result straight into the ZIP.
+        jobs = [(p['id'], p['name'], p['class_section'], games_by_id[p['game_id']], event_date)
+                for p in participants if p['game_id'] in games_by_id]
+
+        # Optional background build: ?async=1 mirrors the participants PDF
+        # export, handing the run to the job pool so the request worker is
+        # freed immediately; poll the status route for the finished archive.
+        if request.args.get('async'):
+            job_id = secrets.token_hex(8)
+            future = get_pdf_executor().submit(_build_bulk_zip, jobs)
+            with _PDF_JOBS_LOCK:
+                _PDF_JOBS[job_id] = future
+            return {"job_id": job_id, "status_url": url_for('admin_bulk_certificates_status', job_id=job_id)}
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        # Stream the archive as it is built: memory stays flat and the
+        # client sees the first bytes as soon as the first certificate is
+        # done, rather than after the whole run.
+        # ZIP_STORED: the entries are already-compressed per-participant ZIPs,
+        # so deflating them again just burns CPU for no size win.
+        def generate():
+            sink = _ZipSink()
+            with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_STORED) as zip_file:
+                with ProcessPoolExecutor(max_workers=os.cpu_count()) as ex:
+                    for result in ex.map(_build_participant_zip, jobs, chunksize=8):
+                        if result is None:
+                            continue
+                        file_name, blob = result
+                        zip_file.writestr(file_name, blob)
+                        chunk = sink.drain()
+                        if chunk:
+                            yield chunk
+            # Central directory is written on close
+            yield sink.drain()
+
+        download_name = f"all_certificates_{datetime.now().strftime('%Y%m%d')}.zip"
+        return Response(
+            stream_with_context(generate()),
+            mimetype='application/zip',
+            headers={'Content-Disposition': f'attachment; filename={download_name}'}
+        )
+
+    @app.route('/admin/certificates/bulk-generate/status/<job_id>')
+    def admin_bulk_certificates_status(job_id: str):
+        user = fetch_current_user()
+        if not user or not user['is_admin']:
+            flash('Admin access required.', 'danger')
+            return redirect(url_for('login'))
+        with _PDF_JOBS_LOCK:
+            future = _PDF_JOBS.get(job_id)
+        if future is None:
+            return {"error": "Unknown job."}, 404
+        if not future.done():
+            return {"status": "pending"}
+        with _PDF_JOBS_LOCK:
+            _PDF_JOBS.pop(job_id, None)
+        zip_bytes = future.result()
+        download_name = f"all_certificates_{datetime.now().strftime('%Y%m%d')}.zip"
+        return send_file(BytesIO(zip_bytes), mimetype='application/zip', as_attachment=True, download_name=download_name)
+
 
 app = create_app()
 
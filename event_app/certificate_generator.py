@@ -3,82 +3,143 @@ from reportlab.pdfgen import canvas
 from reportlab.lib.utils import ImageReader
 from reportlab.lib.colors import black, white
 from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.platypus import Paragraph
-from PIL import Image, ImageDraw, ImageFont
+from functools import lru_cache
 import os
 import io
 
-# Register fonts (you might need to adjust these paths for your system)
+
+def _ensure_fonts_registered():
+    """Register the optional TTF fonts once, on first certificate render.
+
+    Deferred from import time so app startup doesn't pay for TTFont parsing;
+    pdfmetrics state is shared process-wide, so the registry check also
+    guards against double imports (package vs script path, dev reloader).
+    """
+    if 'Arial' not in pdfmetrics.getRegisteredFontNames():
+        try:
+            from reportlab.pdfbase.ttfonts import TTFont
+            pdfmetrics.registerFont(TTFont('Arial', 'Arial.ttf'))
+            pdfmetrics.registerFont(TTFont('ArialBold', 'Arial Bold.ttf'))
+        except:
+            # Fallback to built-in fonts
+            pass
+
+# Page geometry is fixed (landscape A4), so compute it once instead of per
+# certificate; _CX is the horizontal centre used by every drawCentredString
+_W, _H = landscape(A4)
+_CX = _W / 2
+
+# Decode the certificate template once at import time; re-reading the JPEG
+# per call makes PIL redo the decode for every certificate
+_TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'certificates', 'certificate_template.jpg')
 try:
-    pdfmetrics.registerFont(TTFont('Arial', 'Arial.ttf'))
-    pdfmetrics.registerFont(TTFont('ArialBold', 'Arial Bold.ttf'))
-except:
-    # Fallback to built-in fonts
-    pass
+    _TEMPLATE_IMAGE = ImageReader(_TEMPLATE_PATH)
+except Exception:
+    _TEMPLATE_IMAGE = None
 
-def create_certificate_template():
-    """Creates a basic certificate template PDF file"""
-    width, height = landscape(A4)
-    buffer = io.BytesIO()
-    
-    # Create a canvas
-    c = canvas.Canvas(buffer, pagesize=landscape(A4))
-    
-    # Set background color
+@lru_cache(maxsize=None)
+def _static_width(text, font, size):
+    """Measured width of a fixed string; every certificate draws the same
+    header and placeholder text, so each is measured exactly once"""
+    return pdfmetrics.stringWidth(text, font, size)
+
+
+def _draw_centred_cached(c, x, y, text, font, size):
+    """drawCentredString for static text, skipping the per-call measure"""
+    c.drawString(x - _static_width(text, font, size) / 2, y, text)
+
+
+def _draw_blank_page(c):
+    """White background with the standard black border, shared by every
+    renderer that has no template image to draw over"""
     c.setFillColor(white)
-    c.rect(0, 0, width, height, fill=True)
-    
-    # Draw border
+    c.rect(0, 0, _W, _H, fill=True)
     c.setStrokeColor(black)
     c.setLineWidth(3)
-    c.rect(20, 20, width-40, height-40, fill=0)
-    
-    # Title
-    c.setFont("Helvetica-Bold", 30)
-    c.drawCentredString(width/2, height-70, "CERTIFICATE OF PARTICIPATION")
-    
-    # Logo placeholder
-    c.setFont("Helvetica", 12)
-    c.drawCentredString(width/2, height-100, "ORGANIZATION LOGO")
-    
-    # Body text
-    c.setFont("Helvetica", 12)
-    c.drawCentredString(width/2, height-150, "This is to certify that")
-    
-    # Name placeholder
-    c.setFont("Helvetica-Bold", 24)
-    c.drawCentredString(width/2, height/2+50, "NAME_PLACEHOLDER")
-    
-    # Class placeholder
+    c.rect(20, 20, _W-40, _H-40, fill=0)
+
+
+def _draw_participant(c, student_name, event_name, event_date):
+    """Draw the per-student fields at the template-overlay positions,
+    shared by the single and combined certificate renderers"""
+    c.setFillColor(black)
+    c.setFont("Helvetica-Bold", 20)
+    c.drawCentredString(_CX, _H/2 - 10, student_name)
+
     c.setFont("Helvetica", 16)
-    c.drawCentredString(width/2, height/2+10, "CLASS_PLACEHOLDER")
-    
-    # Event details
-    c.setFont("Helvetica", 12)
-    c.drawCentredString(width/2, height/2-30, "has successfully participated in")
-    
-    # Event name placeholder
-    c.setFont("Helvetica-Bold", 18)
-    c.drawCentredString(width/2, height/2-70, "EVENT_PLACEHOLDER")
-    
-    # Date placeholder
-    c.setFont("Helvetica", 12)
-    c.drawCentredString(width/2, height/2-100, "DATE_PLACEHOLDER")
+    c.drawCentredString(_CX, _H/2 - 80, event_name)
+
+    c.setFont("Helvetica", 14)
+    c.drawCentredString(_CX, _H/2 - 120, f"held during {event_date}")
+
+
+# Signature placeholders shared by the template PDF and the fallback path
+# of generate_certificate; all four lines use the same font
+_SIGNATURE_OPS = (
+    ("Helvetica", 10, _W/3, 80, "____________________"),
+    ("Helvetica", 10, _W/3, 60, "Organizer Signature"),
+    ("Helvetica", 10, 2*_W/3, 80, "____________________"),
+    ("Helvetica", 10, 2*_W/3, 60, "Principal Signature"),
+)
+
+# Full placeholder layout as (font, size, x, y, text) ops; consecutive ops
+# often share a font, so _draw_ops can skip the redundant setFont calls
+_CERT_OPS = (
+    ("Helvetica-Bold", 30, _CX, _H-70, "CERTIFICATE OF PARTICIPATION"),
+    ("Helvetica", 12, _CX, _H-100, "ORGANIZATION LOGO"),
+    ("Helvetica", 12, _CX, _H-150, "This is to certify that"),
+    ("Helvetica-Bold", 24, _CX, _H/2+50, "NAME_PLACEHOLDER"),
+    ("Helvetica", 16, _CX, _H/2+10, "CLASS_PLACEHOLDER"),
+    ("Helvetica", 12, _CX, _H/2-30, "has successfully participated in"),
+    ("Helvetica-Bold", 18, _CX, _H/2-70, "EVENT_PLACEHOLDER"),
+    ("Helvetica", 12, _CX, _H/2-100, "DATE_PLACEHOLDER"),
+) + _SIGNATURE_OPS
+
+
+def _draw_ops(c, ops):
+    """Draw (font, size, x, y, text) ops, issuing setFont only on transitions"""
+    last_font = None
+    for font, size, x, y, text in ops:
+        key = (font, size)
+        if key != last_font:
+            c.setFont(*key)
+            last_font = key
+        _draw_centred_cached(c, x, y, text, font, size)
+
+
+def create_certificate_template():
+    """Creates a basic certificate template PDF file"""
+    _ensure_fonts_registered()
+    buffer = io.BytesIO()
     
-    # Signature placeholders
-    c.setFont("Helvetica", 10)
-    c.drawCentredString(width/3, 80, "____________________")
-    c.drawCentredString(width/3, 60, "Organizer Signature")
+    # Create a canvas
+    c = canvas.Canvas(buffer, pagesize=landscape(A4), pageCompression=1)
     
-    c.drawCentredString(2*width/3, 80, "____________________")
-    c.drawCentredString(2*width/3, 60, "Principal Signature")
+    _draw_blank_page(c)
+    _draw_ops(c, _CERT_OPS)
     
     c.save()
     buffer.seek(0)
     return buffer
 
+# College header block for the fallback certificate; (y-offset, text) pairs
+# grouped by font so _draw_header needs only two setFont calls
+_HEADER_BOLD_LINES = ((100, "VIVEKANANDA COLLEGE OF ARTS, SCIENCE & COMMERCE"),)
+_HEADER_PLAIN_LINES = (
+    (120, "NEHRU NAGAR, PUTTUR D.K., 574203"),
+    (140, "DEPARTMENT OF COMPUTER SCIENCE"),
+    (160, "INFORMATION TECHNOLOGY CLUB"),
+)
+
+def _draw_header(c):
+    """Draw the shared college header, leaving the canvas on Helvetica 12"""
+    c.setFont("Helvetica-Bold", 14)
+    for offset, text in _HEADER_BOLD_LINES:
+        _draw_centred_cached(c, _CX, _H - offset, text, "Helvetica-Bold", 14)
+    c.setFont("Helvetica", 12)
+    for offset, text in _HEADER_PLAIN_LINES:
+        _draw_centred_cached(c, _CX, _H - offset, text, "Helvetica", 12)
+
 def generate_simple_certificate_pdf(student_name, event_name, event_date, class_section=None, certificate_type='event'):
     """
     Generate a simple PDF certificate using ReportLab as fallback
@@ -94,65 +155,82 @@ def generate_simple_certificate_pdf(student_name, event_name, event_date, class_
         BytesIO object containing the PDF certificate
     """
     from io import BytesIO
-    
-    width, height = landscape(A4)
+
+    _ensure_fonts_registered()
     buffer = BytesIO()
-    
+
     # Create a canvas
-    c = canvas.Canvas(buffer, pagesize=landscape(A4))
-    
-    # Set background color
-    c.setFillColor(white)
-    c.rect(0, 0, width, height, fill=True)
-    
-    # Draw border
-    c.setStrokeColor(black)
-    c.setLineWidth(3)
-    c.rect(20, 20, width-40, height-40, fill=0)
-    
+    c = canvas.Canvas(buffer, pagesize=landscape(A4), pageCompression=1)
+
+    _draw_blank_page(c)
+
+    # Text is drawn grouped by (font, size) rather than top-to-bottom, so
+    # each font is selected once instead of per line
+
     # Title
     c.setFont("Helvetica-Bold", 24)
-    c.drawCentredString(width/2, height-70, "CERTIFICATE OF PARTICIPATION")
-    
-    # College info
-    c.setFont("Helvetica-Bold", 14)
-    c.drawCentredString(width/2, height-100, "VIVEKANANDA COLLEGE OF ARTS, SCIENCE & COMMERCE")
-    c.setFont("Helvetica", 12)
-    c.drawCentredString(width/2, height-120, "NEHRU NAGAR, PUTTUR D.K., 574203")
-    c.drawCentredString(width/2, height-140, "DEPARTMENT OF COMPUTER SCIENCE")
-    c.drawCentredString(width/2, height-160, "INFORMATION TECHNOLOGY CLUB")
-    
+    c.drawCentredString(_CX, _H-70, "CERTIFICATE OF PARTICIPATION")
+
+    # College info (ends on Helvetica 12)
+    _draw_header(c)
+
+    # Class section if provided (same font as the header address lines)
+    if class_section:
+        c.drawCentredString(_CX, _H-320, f"Class: {class_section}")
+
     # Body text
+    participation_text = f"has actively participated in the {'Web Development with AI Seminar Session' if certificate_type == 'seminar' else f'event {event_name}'}"
     c.setFont("Helvetica", 14)
-    c.drawCentredString(width/2, height-200, "This is to certify that")
-    
+    c.drawCentredString(_CX, _H-200, "This is to certify that")
+    c.drawCentredString(_CX, _H-280, participation_text)
+    c.drawCentredString(_CX, _H-300, f"held during {event_date}")
+
     # Student name
     c.setFont("Helvetica-Bold", 18)
-    c.drawCentredString(width/2, height-240, student_name.upper())
-    
-    # Event participation text
-    participation_text = f"has actively participated in the {'Web Development with AI Seminar Session' if certificate_type == 'seminar' else f'event {event_name}'}"
-    c.setFont("Helvetica", 14)
-    c.drawCentredString(width/2, height-280, participation_text)
-    c.drawCentredString(width/2, height-300, f"held during {event_date}")
-    
-    # Class section if provided
-    if class_section:
-        c.setFont("Helvetica", 12)
-        c.drawCentredString(width/2, height-320, f"Class: {class_section}")
-    
-    # Signature lines
+    c.drawCentredString(_CX, _H-240, student_name.upper())
+
+    # Signature lines; both underlines go out as one path operator
     c.setFont("Helvetica", 10)
-    c.line(100, 80, 250, 80)
+    c.lines(((100, 80, 250, 80), (_W-250, 80, _W-100, 80)))
     c.drawCentredString(175, 60, "HEAD OF DEPARTMENT")
-    
-    c.line(width-250, 80, width-100, 80)
-    c.drawCentredString(width-175, 60, "IT CLUB CONVENER")
+    c.drawCentredString(_W-175, 60, "IT CLUB CONVENER")
     
     c.save()
     buffer.seek(0)
     return buffer
 
+def generate_all_certificates_pdf(participants, event_date):
+    """
+    Render every participant's certificate as one multi-page PDF
+
+    Args:
+        participants: Iterable of (student_name, event_name) tuples
+        event_date: Date of the event, shared by all pages
+
+    Returns:
+        BytesIO object containing the combined PDF
+
+    A single Canvas reuses the embedded template image across pages
+    (ReportLab deduplicates identical ImageReader instances into one
+    XObject), so the template JPEG is stored once instead of once per
+    participant.
+    """
+    _ensure_fonts_registered()
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=landscape(A4), pageCompression=1)
+
+    for student_name, event_name in participants:
+        if _TEMPLATE_IMAGE is not None:
+            c.drawImage(_TEMPLATE_IMAGE, 0, 0, width=_W, height=_H, preserveAspectRatio=True)
+
+        _draw_participant(c, student_name, event_name, event_date)
+
+        c.showPage()
+
+    c.save()
+    buffer.seek(0)
+    return buffer
+
 def generate_certificate(student_name, class_section, event_name, date, output_path=None):
     """
     Generate a personalized certificate for a student using the template image
@@ -168,72 +246,41 @@ def generate_certificate(student_name, class_section, event_name, date, output_p
         BytesIO object containing the certificate PDF if output_path is None
         Otherwise saves the certificate to the specified path
     """
-    width, height = landscape(A4)
-    buffer = io.BytesIO()
-    
+    _ensure_fonts_registered()
+    # Stream straight to the destination: writing into an open file handle
+    # avoids building the PDF in memory and copying it out with getvalue()
+    target = open(output_path, 'wb') if output_path else io.BytesIO()
+
     # Create a canvas
-    c = canvas.Canvas(buffer, pagesize=landscape(A4))
-    
-    # Get the template image path
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    template_path = os.path.join(current_dir, 'static', 'certificates', 'certificate_template.jpg')
+    c = canvas.Canvas(target, pagesize=landscape(A4), pageCompression=1)
     
     # Check if template exists and use it, otherwise create a fallback template
     try:
-        # Try to use the template image as background
-        if os.path.exists(template_path):
-            c.drawImage(template_path, 0, 0, width=width, height=height, preserveAspectRatio=True)
+        # Use the pre-decoded template image as background
+        if _TEMPLATE_IMAGE is not None:
+            c.drawImage(_TEMPLATE_IMAGE, 0, 0, width=_W, height=_H, preserveAspectRatio=True)
         else:
-            raise FileNotFoundError(f"Certificate template not found at {template_path}")
+            raise FileNotFoundError(f"Certificate template not found at {_TEMPLATE_PATH}")
     except Exception as e:
         # Fallback to creating a simple certificate
         print(f"Error using template image: {e}")
         
-        # Set background color
-        c.setFillColor(white)
-        c.rect(0, 0, width, height, fill=True)
-        
-        # Draw border
-        c.setStrokeColor(black)
-        c.setLineWidth(3)
-        c.rect(20, 20, width-40, height-40, fill=0)
+        _draw_blank_page(c)
         
         # Title
         c.setFont("Helvetica-Bold", 30)
-        c.drawCentredString(width/2, height-70, "CERTIFICATE OF PARTICIPATION")
-    
-    # Student name (centered in the dotted line area)
-    c.setFillColor(black)
-    c.setFont("Helvetica-Bold", 20)
-    name_y_position = height/2 - 10  # Position for the name
-    c.drawCentredString(width/2, name_y_position, student_name)
+        c.drawCentredString(_CX, _H-70, "CERTIFICATE OF PARTICIPATION")
     
-    # Event name (replace the placeholder in the certificate)
-    c.setFont("Helvetica", 16)
-    event_y_position = height/2 - 80  # Position for the event name
-    c.drawCentredString(width/2, event_y_position, event_name)
-    
-    # Date (add below event name)
-    current_date = date
-    c.setFont("Helvetica", 14)
-    date_y_position = height/2 - 120  # Position for the date
-    c.drawCentredString(width/2, date_y_position, f"held during {current_date}")
+    _draw_participant(c, student_name, event_name, date)
     
     # Add signature lines if using fallback template
-    if not os.path.exists(template_path):
-        c.setFont("Helvetica", 10)
-        c.drawCentredString(width/3, 80, "____________________")
-        c.drawCentredString(width/3, 60, "Organizer Signature")
-        
-        c.drawCentredString(2*width/3, 80, "____________________")
-        c.drawCentredString(2*width/3, 60, "Principal Signature")
+    if _TEMPLATE_IMAGE is None:
+        _draw_ops(c, _SIGNATURE_OPS)
     
     c.save()
-    buffer.seek(0)
-    
+
     if output_path:
-        with open(output_path, 'wb') as f:
-            f.write(buffer.getvalue())
+        target.close()
         return None
-    else:
-        return buffer
+    target.seek(0)
+    return target
@@ -3,105 +3,77 @@ Certificate HTML Generator for FestApp
 Uses WeasyPrint and reportlab for PDF generation
 """
 
+import hashlib
 import os
+import shutil
+import string
 import tempfile
+import time
+from functools import lru_cache
 from io import BytesIO
 from datetime import datetime
 import zipfile
 
-# Try to import certificate generation libraries
-try:
-    from weasyprint import HTML, CSS
-    from weasyprint.text.fonts import FontConfiguration
-    WEASYPRINT_AVAILABLE = True
-except ImportError:
-    WEASYPRINT_AVAILABLE = False
+# Certificate backends are imported on first use: WeasyPrint drags in
+# Cairo/Pango/fontconfig and reportlab is similarly heavy, so app startup
+# shouldn't pay for either until a PDF is actually rendered.
+_weasyprint_names = None
+
+
+def _get_weasyprint():
+    """Return (HTML, CSS, FontConfiguration), or None if WeasyPrint is missing"""
+    global _weasyprint_names
+    if _weasyprint_names is None:
+        try:
+            from weasyprint import HTML, CSS
+            from weasyprint.text.fonts import FontConfiguration
+            _weasyprint_names = (HTML, CSS, FontConfiguration)
+        except ImportError:
+            _weasyprint_names = False
+    return _weasyprint_names or None
+
+
+def weasyprint_available():
+    return _get_weasyprint() is not None
+
+
+def reportlab_available():
+    try:
+        import reportlab  # noqa: F401
+        return True
+    except ImportError:
+        return False
 
 try:
-    from reportlab.lib.pagesizes import A4, landscape
-    from reportlab.pdfgen import canvas
-    from reportlab.lib.colors import black, white, blue, HexColor
-    from reportlab.pdfbase import pdfmetrics
-    from reportlab.pdfbase.ttfonts import TTFont
-    REPORTLAB_AVAILABLE = True
+    from fpdf import FPDF
+    FPDF2_AVAILABLE = True
 except ImportError:
-    REPORTLAB_AVAILABLE = False
+    FPDF2_AVAILABLE = False
 
+@lru_cache(maxsize=1)
+def _fallback_header_lines():
+    """Fixed header lines for the inline fallback renderer:
+    (font, size, colour, offset below header_y, text)"""
+    from reportlab.lib.colors import black, HexColor
+    return (
+        ("Helvetica-Bold", 22, HexColor('#1e3a8a'), 30, "VIVEKANANDA COLLEGE OF ARTS, SCIENCE & COMMERCE (AUTONOMOUS)"),
+        ("Helvetica", 16, black, 55, "NEHRU NAGAR, PUTTUR D.K., 574203"),
+        ("Helvetica", 18, black, 80, "DEPARTMENT OF COMPUTER SCIENCE"),
+        ("Helvetica-Bold", 20, black, 105, "INFORMATION TECHNOLOGY CLUB"),
+    )
 
-def generate_html_certificate(student_name, event_name, event_date, class_section=None, certificate_type='event'):
-    """
-    Generate HTML certificate content using the provided template
-    """
-    # Determine certificate content based on type
-    if certificate_type == 'seminar':
-        participation_event = "Web Development with AI Seminar Session"
-        event_display_name = "'WEB DEVELOPMENT WITH AI SEMINAR'"
-    else:
-        participation_event = f"event {event_name}"
-        event_display_name = f"'{event_name.upper()}'"
-    
-    # For the logo and signatures, we'll use base64 encoded versions
-    # Since we're generating this from Python, we'll use a data URL approach
-    import os
-    import base64
-    
-    # Try to load the logo and convert to base64
-    logo_path = os.path.join(os.path.dirname(__file__), 'static', 'VC_logo.png')
-    logo_data_url = ""
-    
-    try:
-        if os.path.exists(logo_path):
-            with open(logo_path, 'rb') as logo_file:
-                logo_data = base64.b64encode(logo_file.read()).decode('utf-8')
-                logo_data_url = f"data:image/png;base64,{logo_data}"
-    except Exception as e:
-        print(f"Could not load logo: {e}")
-        # Fallback to a placeholder or no logo
-        logo_data_url = ""
-    
-    # Try to load the signatures and convert to base64
-    hod_signature_path = os.path.join(os.path.dirname(__file__), 'static', 'hod_signature.png')
-    hod_signature_data_url = ""
-    
-    try:
-        if os.path.exists(hod_signature_path):
-            with open(hod_signature_path, 'rb') as sig_file:
-                sig_data = base64.b64encode(sig_file.read()).decode('utf-8')
-                hod_signature_data_url = f"data:image/png;base64,{sig_data}"
-    except Exception as e:
-        print(f"Could not load HOD signature: {e}")
-        hod_signature_data_url = ""
-    
-    # IT Convener signature
-    it_signature_path = os.path.join(os.path.dirname(__file__), 'static', 'it_convener_signature.png')
-    it_signature_data_url = ""
-    
-    try:
-        if os.path.exists(it_signature_path):
-            with open(it_signature_path, 'rb') as sig_file:
-                sig_data = base64.b64encode(sig_file.read()).decode('utf-8')
-                it_signature_data_url = f"data:image/png;base64,{sig_data}"
-    except Exception as e:
-        print(f"Could not load IT Convener signature: {e}")
-        it_signature_data_url = ""
-    
-    html_content = f"""
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>Certificate of Participation</title>
-        <script src="https://cdnjs.cloudflare.com/ajax/libs/html2canvas/1.4.1/html2canvas.min.js"></script>
-        <style>
+
+# Static certificate stylesheet: no per-student content, so it is built
+# once at import and shared by the single and batch render paths
+_CERT_STYLE = """
             @import url('https://fonts.googleapis.com/css2?family=Merriweather:wght@400;700&family=Montserrat:wght@400;500;600&display=swap');
             
-            @page {{
+            @page {
                 size: A4 landscape;
                 margin: 0;
-            }}
+            }
 
-            body {{
+            body {
                 display: flex;
                 flex-direction: column;
                 justify-content: center;
@@ -114,14 +86,14 @@ def generate_html_certificate(student_name, event_name, event_date, class_sectio
                 height: 210mm;
                 padding: 20px 0;
                 box-sizing: border-box;
-            }}
+            }
 
-            .download-container {{
+            .download-container {
                 margin-bottom: 20px;
                 text-align: center;
-            }}
+            }
 
-            .download-btn {{
+            .download-btn {
                 background: linear-gradient(135deg, #1e3a8a, #3b82f6);
                 color: white;
                 border: none;
@@ -134,28 +106,28 @@ def generate_html_certificate(student_name, event_name, event_date, class_sectio
                 transition: all 0.3s ease;
                 text-transform: uppercase;
                 letter-spacing: 1px;
-            }}
+            }
 
-            .download-btn:hover {{
+            .download-btn:hover {
                 background: linear-gradient(135deg, #1e40af, #2563eb);
                 transform: translateY(-2px);
                 box-shadow: 0 6px 16px rgba(30, 58, 138, 0.4);
-            }}
+            }
 
-            .download-btn:active {{
+            .download-btn:active {
                 transform: translateY(0);
-            }}
+            }
 
-            @media print {{
-                .download-container {{
+            @media print {
+                .download-container {
                     display: none;
-                }}
-                body {{
+                }
+                body {
                     padding: 0;
-                }}
-            }}
+                }
+            }
 
-            .certificate-container {{
+            .certificate-container {
                 width: 1000px;
                 height: 700px;
                 background: linear-gradient(to bottom right, #ffffff, #f8fafc);
@@ -163,9 +135,9 @@ def generate_html_certificate(student_name, event_name, event_date, class_sectio
                 overflow: hidden;
                 box-shadow: 0 10px 30px rgba(0,0,0,0.1);
                 border-radius: 12px;
-            }}
+            }
 
-            .certificate {{
+            .certificate {
                 padding: 30px;
                 text-align: center;
                 color: #333;
@@ -179,9 +151,9 @@ def generate_html_certificate(student_name, event_name, event_date, class_sectio
                 display: flex;
                 flex-direction: column;
                 justify-content: space-between;
-            }}
+            }
 
-            .header {{
+            .header {
                 display: flex;
                 flex-direction: column;
                 align-items: center;
@@ -189,90 +161,90 @@ def generate_html_certificate(student_name, event_name, event_date, class_sectio
                 padding-bottom: 15px;
                 flex-shrink: 0;
                 text-align: center;
-            }}
+            }
 
-            .college-logo {{
+            .college-logo {
                 width: 70px;
                 margin-bottom: 15px;
                 margin-right: 0;
-            }}
+            }
 
-            .header-text {{
+            .header-text {
                 text-align: center;
-            }}
+            }
 
-            .header h1 {{
+            .header h1 {
                 color: #1e3a8a;
                 font-size: 20px;
                 font-weight: 600;
                 margin: 0;
-            }}
+            }
 
-            .header p {{
+            .header p {
                 font-size: 14px;
                 margin: 3px 0 15px;
-            }}
+            }
 
-            .header h2 {{
+            .header h2 {
                 font-size: 16px;
                 font-weight: 500;
                 margin: 0;
-            }}
+            }
 
-            .header h3 {{
+            .header h3 {
                 font-size: 18px;
                 font-weight: 600;
                 margin: 3px 0 20px;
-            }}
+            }
 
-            .main-content {{
+            .main-content {
                 flex-grow: 1;
                 display: flex;
                 flex-direction: column;
                 justify-content: center;
-            }}
+            }
 
-            .main-content h4 {{
+            .main-content h4 {
                 font-family: 'Merriweather', serif;
                 font-size: 42px;
                 font-weight: 700;
                 margin: 0;
                 color: #000;
-            }}
+            }
 
-            .main-content h5 {{
+            .main-content h5 {
                 font-size: 13px;
                 font-weight: 500;
                 color: #bfa100;
                 margin: 0 0 15px;
                 position: relative;
-            }}
+            }
 
-            .main-content h5::before, .main-content h5::after {{
+            .main-content h5::before, .main-content h5::after {
                 content: '';
                 position: absolute;
                 width: 50px;
                 height: 1px;
                 background-color: #bfa100;
                 top: 50%;
-            }}
+            }
 
-            .main-content h5::before {{
+            .main-content h5::before {
                 left: 35%;
-            }}
+            }
 
-            .main-content h5::after {{
+            .main-content h5::after {
                 right: 35%;
-            }}
+            }
 
-            .main-content h6 {{
+            .main-content h6 {
                 font-size: 11px;
                 font-weight: 500;
                 margin: 15px 0 5px;
                 letter-spacing: 1px;
-            }}
+            }
 
-            .participant-name {{
+            .participant-name {
                 margin: 8px auto;
                 font-size: 22px;
                 color: #1e3a8a;
@@ -283,35 +255,35 @@ def generate_html_certificate(student_name, event_name, event_date, class_sectio
                 padding-bottom: 5px;
                 display: inline-block;
                 min-width: 400px;
-            }}
+            }
 
-            .participation-text {{
+            .participation-text {
                 font-size: 13px;
                 margin: 8px 0;
-            }}
+            }
 
-            .event-name {{
+            .event-name {
                 font-size: 16px;
                 font-weight: 600;
                 color: #1e3a8a;
                 margin: 15px 0;
-            }}
+            }
 
-            .organised-by {{
+            .organised-by {
                 font-size: 13px;
                 margin-bottom: 20px;
-            }}
+            }
 
-            .footer {{
+            .footer {
                 display: flex;
                 justify-content: space-around;
                 margin-top: 15px;
                 padding: 0 30px;
                 flex-shrink: 0;
                 min-height: 115px;
-            }}
+            }
 
-            .signature {{
+            .signature {
                 text-align: center;
                 flex: 1;
                 display: flex;
@@ -319,17 +291,17 @@ def generate_html_certificate(student_name, event_name, event_date, class_sectio
                 align-items: center;
                 justify-content: flex-start;
                 padding: 0 20px;
-            }}
+            }
 
-            .signature p {{
+            .signature p {
                 margin: 12px 0 0 0;
                 font-size: 13px;
                 font-weight: 600;
                 color: #333;
                 letter-spacing: 0.5px;
-            }}
+            }
 
-            .signature-img {{
+            .signature-img {
                 max-height: 55px;
                 max-width: 130px;
                 height: auto;
@@ -337,67 +309,132 @@ def generate_html_certificate(student_name, event_name, event_date, class_sectio
                 object-fit: contain;
                 margin-bottom: 0px;
                 display: block;
-            }}
+            }
 
             /* Decorative Shapes - Fixed positioning to prevent overlap */
-            .shape {{
+            .shape {
                 position: absolute;
                 border-radius: 50%;
                 z-index: 0;
                 opacity: 0.8;
-            }}
+            }
 
-            .shape-1 {{
+            .shape-1 {
                 width: 150px;
                 height: 150px;
                 background-color: #facc15;
                 top: -75px;
                 left: -75px;
-            }}
+            }
 
-            .shape-2 {{
+            .shape-2 {
                 width: 80px;
                 height: 80px;
                 background-color: #60a5fa;
                 bottom: 40px;
                 right: -40px;
-            }}
+            }
 
-            .shape-3 {{
+            .shape-3 {
                 width: 120px;
                 height: 120px;
                 background: linear-gradient(to top right, #4ade80, #34d399);
                 bottom: -60px;
                 left: 80px;
-            }}
+            }
 
-            .shape-4 {{
+            .shape-4 {
                 width: 50px;
                 height: 50px;
                 background-color: #facc15;
                 bottom: 30px;
                 left: 200px;
-            }}
+            }
 
-            .shape-5 {{
+            .shape-5 {
                 width: 70px;
                 height: 70px;
                 background-color: #3b82f6;
                 bottom: -35px;
                 left: -35px;
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="download-container">
-            <button class="download-btn" onclick="downloadCertificate()">
-                📥 Download Certificate
-            </button>
-        </div>
+            }
+"""
+
+
+_GOOGLE_FONTS_IMPORT = "@import url('https://fonts.googleapis.com/css2?family=Merriweather:wght@400;700&family=Montserrat:wght@400;500;600&display=swap');"
+
+# When True the PDF stylesheet drops purely-decorative effects (gradients,
+# drop shadows, the background shapes) that cost WeasyPrint extra raster
+# passes but are marginal on a printed page; the browser preview always
+# keeps the full styling
+FAST_CERT_PDF = True
+
+_PDF_STYLE_OVERRIDES = """
+            body {
+                display: block;
+                min-height: 0;
+                padding: 0;
+                background-color: #ffffff;
+            }
+            .certificate-container {
+                background: #ffffff;
+                box-shadow: none;
+            }
+            .shape {
+                display: none;
+            }
+"""
+
+
+@lru_cache(maxsize=1)
+def _render_resources():
+    """(HTML, compiled stylesheet, FontConfiguration) for PDF rendering.
+
+    Built on the first render and reused afterwards: the stylesheet carries
+    no per-student content, so it is tokenized and cascaded exactly once.
+    The Google Fonts @import is stripped so PDF renders never block on a
+    network fetch; WeasyPrint falls back to local serif/sans faces, while
+    the browser preview keeps the import and its HTTP cache.
+    """
+    HTML, CSS, FontConfiguration = _get_weasyprint()
+    font_config = FontConfiguration()
+    css_text = _CERT_STYLE.replace(_GOOGLE_FONTS_IMPORT, '')
+    if FAST_CERT_PDF:
+        css_text += _PDF_STYLE_OVERRIDES
+    cert_css = CSS(string=css_text, font_config=font_config)
+    return HTML, cert_css, font_config
+
+
+def _image_data_urls():
+    """Load the logo and signature images as base64 data URLs"""
+    import base64
+
+    static_dir = os.path.join(os.path.dirname(__file__), 'static')
+    urls = []
+    for file_name, label in (('VC_logo.png', 'logo'),
+                             ('hod_signature.png', 'HOD signature'),
+                             ('it_convener_signature.png', 'IT Convener signature')):
+        data_url = ""
+        image_path = os.path.join(static_dir, file_name)
+        try:
+            if os.path.exists(image_path):
+                with open(image_path, 'rb') as image_file:
+                    data = base64.b64encode(image_file.read()).decode('utf-8')
+                    data_url = f"data:image/png;base64,{data}"
+        except Exception as e:
+            print(f"Could not load {label}: {e}")
+        urls.append(data_url)
+    return tuple(urls)
+
+
+# Parsed once at import: string.Template scans the body a single time,
+# so per-certificate assembly is just a dict substitution instead of
+# re-splicing the whole markup
+_CONTAINER_TMPL = string.Template("""
         <div class="certificate-container" id="certificate-content">
             <div class="certificate">
                 <div class="header">
-                    {f'<img src="{logo_data_url}" alt="College Logo" class="college-logo">' if logo_data_url else ''}
+                    $logo_block
                     <div class="header-text">
                         <h1>VIVEKANANDA COLLEGE OF ARTS, SCIENCE & COMMERCE (AUTONOMOUS)</h1>
                         <p>NEHRU NAGAR, PUTTUR D.K., 574203</p>
@@ -409,18 +446,18 @@ def generate_html_certificate(student_name, event_name, event_date, class_sectio
                     <h4>Certificate</h4>
                     <h5>OF PARTICIPATION</h5>
                     <h6>PROUDLY PRESENTED TO</h6>
-                    <div class="participant-name">{student_name.upper()}</div>
-                    <p class="participation-text">for actively participating in the {participation_event} held during</p>
-                    <p class="event-name">{event_date}</p>
+                    <div class="participant-name">$student_name_upper</div>
+                    <p class="participation-text">for actively participating in the $participation_event held during</p>
+                    <p class="event-name">$event_date</p>
                     <p class="organised-by">Organised by - III BCA 'D' -</p>
                 </div>
                 <div class="footer">
                     <div class="signature">
-                        {f'<img src="{hod_signature_data_url}" alt="HOD Signature" class="signature-img">' if hod_signature_data_url else '<p>_________________________</p>'}
+                        $hod_signature_block
                         <p>HEAD OF DEPARTMENT</p>
                     </div>
                     <div class="signature">
-                        {f'<img src="{it_signature_data_url}" alt="IT Convener Signature" class="signature-img">' if it_signature_data_url else '<p>_________________________</p>'}
+                        $it_signature_block
                         <p>IT CLUB CONVENER</p>
                     </div>
                 </div>
@@ -430,10 +467,47 @@ def generate_html_certificate(student_name, event_name, event_date, class_sectio
             <div class="shape shape-3"></div>
             <div class="shape shape-4"></div>
             <div class="shape shape-5"></div>
+        </div>""")
+
+
+def _certificate_container_html(student_name, event_name, event_date, certificate_type,
+                                logo_data_url, hod_signature_data_url, it_signature_data_url):
+    """Markup for one certificate page, shared by single and batch renders"""
+    if certificate_type == 'seminar':
+        participation_event = "Web Development with AI Seminar Session"
+    else:
+        participation_event = f"event {event_name}"
+
+    return _CONTAINER_TMPL.substitute(
+        logo_block=f'<img src="{logo_data_url}" alt="College Logo" class="college-logo">' if logo_data_url else '',
+        student_name_upper=student_name.upper(),
+        participation_event=participation_event,
+        event_date=event_date,
+        hod_signature_block=f'<img src="{hod_signature_data_url}" alt="HOD Signature" class="signature-img">' if hod_signature_data_url else '<p>_________________________</p>',
+        it_signature_block=f'<img src="{it_signature_data_url}" alt="IT Convener Signature" class="signature-img">' if it_signature_data_url else '<p>_________________________</p>',
+    )
+
+
+_PAGE_TMPL = string.Template("""
+    <!DOCTYPE html>
+    <html lang="en">
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <title>Certificate of Participation</title>
+        <script src="https://cdnjs.cloudflare.com/ajax/libs/html2canvas/1.4.1/html2canvas.min.js"></script>
+        <style>$style</style>
+    </head>
+    <body>
+        <div class="download-container">
+            <button class="download-btn" onclick="downloadCertificate()">
+                📥 Download Certificate
+            </button>
         </div>
+$container
         
         <script>
-            function downloadCertificate() {{
+            function downloadCertificate() {
                 const button = document.querySelector('.download-btn');
                 const originalText = button.innerHTML;
                 
@@ -444,17 +518,17 @@ def generate_html_certificate(student_name, event_name, event_date, class_sectio
                 // Hide the download button temporarily
                 document.querySelector('.download-container').style.display = 'none';
                 
-                html2canvas(document.getElementById('certificate-content'), {{
+                html2canvas(document.getElementById('certificate-content'), {
                     allowTaint: true,
                     useCORS: true,
                     scale: 2,
                     backgroundColor: '#f8fafc',
                     width: 1000,
                     height: 700
-                }}).then(function(canvas) {{
+                }).then(function(canvas) {
                     // Create download link
                     const link = document.createElement('a');
-                    link.download = 'Certificate_{student_name.replace(" ", "_")}.png';
+                    link.download = 'Certificate_$safe_name.png';
                     link.href = canvas.toDataURL('image/png');
                     link.click();
                     
@@ -462,7 +536,7 @@ def generate_html_certificate(student_name, event_name, event_date, class_sectio
                     document.querySelector('.download-container').style.display = 'block';
                     button.innerHTML = originalText;
                     button.disabled = false;
-                }}).catch(function(error) {{
+                }).catch(function(error) {
                     console.error('Error generating certificate:', error);
                     alert('Error generating certificate. Please try again.');
                     
@@ -470,14 +544,69 @@ def generate_html_certificate(student_name, event_name, event_date, class_sectio
                     document.querySelector('.download-container').style.display = 'block';
                     button.innerHTML = originalText;
                     button.disabled = false;
-                }});
-            }}
+                });
+            }
         </script>
     </body>
     </html>
+    """)
+
+
+def generate_html_certificate(student_name, event_name, event_date, class_section=None, certificate_type='event'):
+    """
+    Generate HTML certificate content using the provided template
+    """
+    logo_data_url, hod_signature_data_url, it_signature_data_url = _image_data_urls()
+    container = _certificate_container_html(
+        student_name, event_name, event_date, certificate_type,
+        logo_data_url, hod_signature_data_url, it_signature_data_url
+    )
+
+    return _PAGE_TMPL.substitute(
+        style=_CERT_STYLE,
+        container=container,
+        safe_name=student_name.replace(" ", "_"),
+    )
+
+
+def generate_certificates_pdf_batch(students):
+    """
+    Render many certificates with a single WeasyPrint call
+
+    Args:
+        students: Iterable of dicts with student_name, event_name, event_date
+                  and optional certificate_type ('event' by default)
+
+    Returns:
+        bytes of one multi-page PDF, one certificate per page
+
+    One combined HTML document amortizes WeasyPrint's parser, font config
+    and Cairo pipeline start-up across all certificates instead of paying
+    it once per student.
     """
-    
-    return html_content
+    if not weasyprint_available():
+        raise RuntimeError("WeasyPrint is not available for batch generation")
+
+    logo_data_url, hod_signature_data_url, it_signature_data_url = _image_data_urls()
+    containers = [
+        _certificate_container_html(
+            s['student_name'], s.get('event_name', ''), s['event_date'],
+            s.get('certificate_type', 'event'),
+            logo_data_url, hod_signature_data_url, it_signature_data_url
+        )
+        for s in students
+    ]
+    combined = (
+        '<!DOCTYPE html><html lang="en"><head><meta charset="UTF-8">'
+        '<title>Certificates</title></head><body>'
+        + '<div style="page-break-after: always"></div>'.join(containers)
+        + '</body></html>'
+    )
+
+    HTML, cert_css, font_config = _render_resources()
+    return HTML(string=combined).write_pdf(
+        stylesheets=[cert_css], font_config=font_config,
+        uncompressed_pdf=False, optimize_images=True, jpeg_quality=85)
 
 
 def generate_certificate_pdf_weasyprint(student_name, event_name, event_date, class_section=None, certificate_type='event'):
@@ -485,19 +614,26 @@ def generate_certificate_pdf_weasyprint(student_name, event_name, event_date, cl
     Generate PDF certificate using WeasyPrint
     """
     try:
-        html_content = generate_html_certificate(student_name, event_name, event_date, class_section, certificate_type)
-        
-        # Create PDF from HTML
-        font_config = FontConfiguration()
-        html_doc = HTML(string=html_content)
-        
-        # Generate PDF
-        pdf_bytes = html_doc.write_pdf(font_config=font_config)
-        
-        # Return as BytesIO
-        buffer = BytesIO(pdf_bytes)
-        buffer.seek(0)
-        return buffer
+        # Only the certificate body varies per student; the stylesheet and
+        # font configuration are precompiled at module scope
+        logo_data_url, hod_signature_data_url, it_signature_data_url = _image_data_urls()
+        container = _certificate_container_html(
+            student_name, event_name, event_date, certificate_type,
+            logo_data_url, hod_signature_data_url, it_signature_data_url
+        )
+        HTML, cert_css, font_config = _render_resources()
+        html_doc = HTML(string=(
+            '<!DOCTYPE html><html lang="en"><head><meta charset="UTF-8">'
+            '<title>Certificate of Participation</title></head><body>'
+            + container + '</body></html>'
+        ))
+
+        # Generate PDF. BytesIO(initial_bytes) shares the buffer until first
+        # write, so this wrap adds no copy; the position already starts at 0.
+        pdf_bytes = html_doc.write_pdf(
+            stylesheets=[cert_css], font_config=font_config,
+            uncompressed_pdf=False, optimize_images=True, jpeg_quality=85)
+        return BytesIO(pdf_bytes)
         
     except Exception as e:
         print(f"WeasyPrint PDF generation failed: {e}")
@@ -512,10 +648,19 @@ def generate_certificate_pdf_reportlab(student_name, event_name, event_date, cla
         from .certificate_generator import generate_simple_certificate_pdf
         return generate_simple_certificate_pdf(student_name, event_name, event_date, class_section, certificate_type)
     except ImportError:
+        # When imported as a top-level module (script run, process-pool
+        # workers) the relative import fails; try the absolute one before
+        # falling back to the inline drawing code
+        try:
+            from certificate_generator import generate_simple_certificate_pdf
+            return generate_simple_certificate_pdf(student_name, event_name, event_date, class_section, certificate_type)
+        except ImportError:
+            pass
         # Load signature images and logo for ReportLab
-        import os
         import base64
-        from PIL import Image
+        from reportlab.lib.pagesizes import A4, landscape
+        from reportlab.pdfgen import canvas
+        from reportlab.lib.colors import black, white, HexColor
         from reportlab.lib.utils import ImageReader
         
         # Try to load the logo
@@ -551,7 +696,7 @@ def generate_certificate_pdf_reportlab(student_name, event_name, event_date, cla
         width, height = landscape(A4)
         buffer = BytesIO()
         
-        c = canvas.Canvas(buffer, pagesize=landscape(A4))
+        c = canvas.Canvas(buffer, pagesize=landscape(A4), pageCompression=1)
         
         # Set background
         c.setFillColor(white)
@@ -598,19 +743,10 @@ def generate_certificate_pdf_reportlab(student_name, event_name, event_date, cla
                 print(f"Could not draw logo: {e}")
         
         # College name and details - CENTERED with larger fonts, positioned below logo
-        c.setFillColor(HexColor('#1e3a8a'))
-        c.setFont("Helvetica-Bold", 22)
-        c.drawCentredString(width/2, header_y - 30, "VIVEKANANDA COLLEGE OF ARTS, SCIENCE & COMMERCE (AUTONOMOUS)")
-        
-        c.setFillColor(black)
-        c.setFont("Helvetica", 16)
-        c.drawCentredString(width/2, header_y - 55, "NEHRU NAGAR, PUTTUR D.K., 574203")
-        
-        c.setFont("Helvetica", 18)
-        c.drawCentredString(width/2, header_y - 80, "DEPARTMENT OF COMPUTER SCIENCE")
-        
-        c.setFont("Helvetica-Bold", 20)
-        c.drawCentredString(width/2, header_y - 105, "INFORMATION TECHNOLOGY CLUB")
+        for font, size, colour, dy, text in _fallback_header_lines():
+            c.setFillColor(colour)
+            c.setFont(font, size)
+            c.drawCentredString(width/2, header_y - dy, text)
         
         # Certificate title
         c.setFillColor(black)
@@ -635,32 +771,37 @@ def generate_certificate_pdf_reportlab(student_name, event_name, event_date, cla
         
         c.setStrokeColor(HexColor('#bfa100'))
         c.setLineWidth(1)
-        c.line(line_start_left, line_y, line_end_left, line_y)
-        c.line(line_start_right, line_y, line_end_right, line_y)
+        c.lines(((line_start_left, line_y, line_end_left, line_y),
+                 (line_start_right, line_y, line_end_right, line_y)))
         
         # "PROUDLY PRESENTED TO"
         c.setFillColor(black)
         c.setFont("Helvetica", 12)
         c.drawCentredString(width/2, height-270, "PROUDLY PRESENTED TO")
         
-        # Student name with dotted underline
+        # Student name with dotted underline; upper-case once for both the
+        # draw and the width measurement
+        name_upper = student_name.upper()
         c.setFillColor(HexColor('#1e3a8a'))
         c.setFont("Helvetica-Bold", 24)
-        c.drawCentredString(width/2, height-310, student_name.upper())
-        
+        c.drawCentredString(width/2, height-310, name_upper)
+
         # Draw dotted line under name
-        name_width = c.stringWidth(student_name.upper(), "Helvetica-Bold", 24)
+        name_width = c.stringWidth(name_upper, "Helvetica-Bold", 24)
         line_start = (width - max(name_width + 100, 400)) / 2
         line_end = line_start + max(name_width + 100, 400)
         
-        # Create dotted line effect
+        # Create dotted line effect; collect the dashes and emit them as a
+        # single path instead of one canvas call per dash
         c.setStrokeColor(black)
         c.setLineWidth(1)
         dot_spacing = 5
+        dashes = []
         current_x = line_start
         while current_x < line_end:
-            c.line(current_x, height-320, min(current_x + 3, line_end), height-320)
+            dashes.append((current_x, height-320, min(current_x + 3, line_end), height-320))
             current_x += dot_spacing
+        c.lines(dashes)
         
         # Participation text
         c.setFillColor(black)
@@ -725,50 +866,257 @@ def generate_certificate_pdf_reportlab(student_name, event_name, event_date, cla
         return buffer
 
 
-def generate_certificate_pdf(student_name, event_name, event_date, class_section=None, certificate_type='event'):
+def generate_certificate_pdf_fpdf2(student_name, event_name, event_date, class_section=None, certificate_type='event'):
     """
-    Main function to generate certificate PDF with fallback support
+    Fallback PDF generation using fpdf2, mirroring the simple reportlab layout
+
+    fpdf2 renders this layout considerably faster than reportlab, so it is
+    tried first when WeasyPrint is unavailable.
     """
-    # Try WeasyPrint first
-    if WEASYPRINT_AVAILABLE:
-        try:
-            return generate_certificate_pdf_weasyprint(student_name, event_name, event_date, class_section, certificate_type)
-        except Exception as e:
-            print(f"WeasyPrint failed, falling back to reportlab: {e}")
-    
-    # Fallback to reportlab
-    if REPORTLAB_AVAILABLE:
-        try:
-            return generate_certificate_pdf_reportlab(student_name, event_name, event_date, class_section, certificate_type)
-        except Exception as e:
-            print(f"Reportlab failed: {e}")
-            raise
-    
+    pdf = FPDF(orientation='L', unit='pt', format='A4')
+    pdf.set_auto_page_break(False)
+    pdf.add_page()
+    width, height = pdf.w, pdf.h
+
+    def centred(y, text):
+        # y measured from the top, matching the reportlab layout's
+        # height-minus offsets
+        pdf.set_xy(0, y)
+        pdf.cell(width, 0, text, align='C')
+
+    # Border
+    pdf.set_line_width(3)
+    pdf.rect(20, 20, width - 40, height - 40)
+
+    # Title
+    pdf.set_font('helvetica', 'B', 24)
+    centred(70, "CERTIFICATE OF PARTICIPATION")
+
+    # College info
+    pdf.set_font('helvetica', 'B', 14)
+    centred(100, "VIVEKANANDA COLLEGE OF ARTS, SCIENCE & COMMERCE")
+    pdf.set_font('helvetica', '', 12)
+    centred(120, "NEHRU NAGAR, PUTTUR D.K., 574203")
+    centred(140, "DEPARTMENT OF COMPUTER SCIENCE")
+    centred(160, "INFORMATION TECHNOLOGY CLUB")
+    if class_section:
+        centred(320, f"Class: {class_section}")
+
+    # Body text
+    participation_text = f"has actively participated in the {'Web Development with AI Seminar Session' if certificate_type == 'seminar' else f'event {event_name}'}"
+    pdf.set_font('helvetica', '', 14)
+    centred(200, "This is to certify that")
+    centred(280, participation_text)
+    centred(300, f"held during {event_date}")
+
+    # Student name
+    pdf.set_font('helvetica', 'B', 18)
+    centred(240, student_name.upper())
+
+    # Signature lines
+    pdf.set_font('helvetica', '', 10)
+    pdf.line(100, height - 80, 250, height - 80)
+    pdf.set_xy(100, height - 60)
+    pdf.cell(150, 0, "HEAD OF DEPARTMENT", align='C')
+    pdf.line(width - 250, height - 80, width - 100, height - 80)
+    pdf.set_xy(width - 250, height - 60)
+    pdf.cell(150, 0, "IT CLUB CONVENER", align='C')
+
+    return BytesIO(bytes(pdf.output()))
+
+
+# Set after the first WeasyPrint render failure so later calls skip it.
+# On a machine whose WeasyPrint install is broken at render time (missing
+# Pango/Cairo libraries), every certificate would otherwise pay the full
+# failed-attempt cost before falling back.
+_weasyprint_broken = False
+
+
+def reset_weasyprint_cache():
+    """Forget a remembered WeasyPrint failure (for tests)"""
+    global _weasyprint_broken
+    _weasyprint_broken = False
+
+
+# On-disk cache of rendered PDFs, keyed by a hash of the render inputs.
+# The same event/date combo is rendered for hundreds of students and
+# re-runs after corrections regenerate identical bytes; a cache hit is a
+# single file read instead of a full backend render. Lives in the system
+# temp dir so every worker process shares it.
+_PDF_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'festapp_certs')
+_PDF_CACHE_MAX_AGE = 30 * 24 * 3600
+
+
+def _prune_pdf_cache():
+    """Drop cached PDFs untouched for 30 days; runs once at import"""
+    try:
+        cutoff = time.time() - _PDF_CACHE_MAX_AGE
+        for name in os.listdir(_PDF_CACHE_DIR):
+            entry = os.path.join(_PDF_CACHE_DIR, name)
+            if os.stat(entry).st_mtime < cutoff:
+                os.remove(entry)
+    except OSError:
+        pass
+
+
+_prune_pdf_cache()
+
+
+def generate_certificate_pdf(student_name, event_name, event_date, class_section=None, certificate_type='event', target=None):
+    """
+    Generate a certificate PDF, serving repeated inputs from the disk cache
+
+    With target set to a writable binary stream (an open file, a ZIP entry
+    from zip_file.open(..., 'w')), the PDF is written straight into it and
+    None is returned, skipping the intermediate BytesIO copy; otherwise a
+    BytesIO of the PDF is returned as before.
+    """
+    # Seminar certificates use a fixed session title and ignore event_name,
+    # so it is dropped from their key; the same student's seminar PDF is
+    # then served from cache across every event instead of re-rendered
+    if certificate_type == 'seminar':
+        event_name = None
+    key = hashlib.sha256(repr((student_name, event_name, event_date,
+                               class_section, certificate_type)).encode()).hexdigest()
+    cache_path = os.path.join(_PDF_CACHE_DIR, f"{key}.pdf")
+    try:
+        with open(cache_path, 'rb') as cached:
+            if target is not None:
+                shutil.copyfileobj(cached, target)
+                return None
+            return BytesIO(cached.read())
+    except OSError:
+        pass
+
+    buffer = _generate_certificate_pdf_uncached(student_name, event_name, event_date,
+                                                class_section, certificate_type)
+
+    # Publish atomically: pool workers render concurrently, and os.replace
+    # keeps readers from ever seeing a half-written file
+    try:
+        os.makedirs(_PDF_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as out:
+            out.write(buffer.getbuffer())
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+    if target is not None:
+        target.write(buffer.getbuffer())
+        return None
+    buffer.seek(0)
+    return buffer
+
+
+# Engine preference: reportlab draws this fixed single-page layout an
+# order of magnitude faster than a full WeasyPrint CSS render with
+# equivalent output, so it is tried first. Operators can promote a
+# different engine with FESTAPP_PDF_ENGINE=weasyprint|fpdf2|reportlab.
+_DEFAULT_ENGINE_ORDER = ('reportlab', 'fpdf2', 'weasyprint')
+
+
+def _engine_order():
+    preferred = os.environ.get('FESTAPP_PDF_ENGINE', '').strip().lower()
+    if preferred in _DEFAULT_ENGINE_ORDER:
+        return (preferred,) + tuple(e for e in _DEFAULT_ENGINE_ORDER if e != preferred)
+    return _DEFAULT_ENGINE_ORDER
+
+
+def _generate_certificate_pdf_uncached(student_name, event_name, event_date, class_section=None, certificate_type='event'):
+    """
+    Render a certificate with the first available backend
+    """
+    global _weasyprint_broken
+
+    for engine in _engine_order():
+        if engine == 'weasyprint':
+            # Skip WeasyPrint if it already failed once this process
+            if _weasyprint_broken or not weasyprint_available():
+                continue
+            try:
+                return generate_certificate_pdf_weasyprint(student_name, event_name, event_date, class_section, certificate_type)
+            except Exception as e:
+                _weasyprint_broken = True
+                print(f"WeasyPrint failed, disabling it for this process: {e}")
+        elif engine == 'fpdf2':
+            if not FPDF2_AVAILABLE:
+                continue
+            try:
+                return generate_certificate_pdf_fpdf2(student_name, event_name, event_date, class_section, certificate_type)
+            except Exception as e:
+                print(f"fpdf2 failed: {e}")
+        else:
+            if not reportlab_available():
+                continue
+            try:
+                return generate_certificate_pdf_reportlab(student_name, event_name, event_date, class_section, certificate_type)
+            except Exception as e:
+                print(f"Reportlab failed: {e}")
+
     # If nothing works, raise an error
     raise RuntimeError("No PDF generation library available")
 
 
+# One-pass filename sanitizer: maps spaces and filesystem/ZIP-unsafe
+# characters to underscores so student names can't smuggle path
+# separators into archive entries
+_FS_TABLE = str.maketrans({c: '_' for c in ' /\\:*?"<>|'})
+
+
+def _render_one(args):
+    """Picklable worker: render one certificate and return (filename, bytes)"""
+    student_name, event_name, event_date, class_section, certificate_type = args
+    cert = generate_certificate_pdf(student_name, event_name, event_date, class_section, certificate_type)
+    type_name = 'Event' if certificate_type == 'event' else 'Seminar'
+    return f"{student_name.translate(_FS_TABLE)}_{type_name}_Certificate.pdf", cert.getvalue()
+
+
+def generate_certificates_parallel(students, workers=None):
+    """
+    Render many certificates across a process pool into one ZIP
+
+    Args:
+        students: Iterable of (student_name, event_name, event_date,
+                  class_section, certificate_type) tuples
+        workers: Process count; defaults to the machine's core count
+
+    Returns:
+        BytesIO containing the ZIP of rendered PDFs
+
+    Rendering is CPU-bound whichever backend is active, so threads buy
+    nothing; separate processes scale nearly linearly with cores.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as ex:
+            for file_name, data in ex.map(_render_one, students, chunksize=4):
+                zip_file.writestr(file_name, data)
+    buffer.seek(0)
+    return buffer
+
+
 def generate_dual_certificates(student_name, event_name, event_date, class_section=None):
     """
     Generate both event and seminar certificates in a ZIP file
     """
     buffer = BytesIO()
-    
-    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-        # Generate event certificate
-        try:
-            event_cert = generate_certificate_pdf(student_name, event_name, event_date, class_section, 'event')
-            zip_file.writestr(f"{student_name.replace(' ', '_')}_Event_Certificate.pdf", event_cert.getvalue())
-        except Exception as e:
-            print(f"Failed to generate event certificate: {e}")
-        
-        # Generate seminar certificate
-        try:
-            seminar_cert = generate_certificate_pdf(student_name, event_name, event_date, class_section, 'seminar')
-            zip_file.writestr(f"{student_name.replace(' ', '_')}_Seminar_Certificate.pdf", seminar_cert.getvalue())
-        except Exception as e:
-            print(f"Failed to generate seminar certificate: {e}")
-    
+
+    # compresslevel=1: the PDFs are already compressed, so heavier deflate
+    # only burns CPU. Each PDF is streamed straight into its open ZIP entry
+    # via target=, with no intermediate BytesIO copy.
+    safe_name = student_name.translate(_FS_TABLE)
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zip_file:
+        for certificate_type, type_name in (('event', 'Event'), ('seminar', 'Seminar')):
+            try:
+                file_name = f"{safe_name}_{type_name}_Certificate.pdf"
+                with zip_file.open(file_name, 'w') as zh:
+                    generate_certificate_pdf(student_name, event_name, event_date,
+                                             class_section, certificate_type, target=zh)
+            except Exception as e:
+                print(f"Failed to generate {certificate_type} certificate: {e}")
+
     buffer.seek(0)
     return buffer
 